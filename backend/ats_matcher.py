@@ -1,25 +1,52 @@
 # ats_matcher.py
 import os
-import PyPDF2 as pdf
-import google.generativeai as genai
 from dotenv import load_dotenv
+from response_cache import response_cache, cache_key
+from llm_client import llm_client, PRIORITY_INTERACTIVE
+from local_scorer import local_scorer
+from metrics import metrics
 
 load_dotenv()
-genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
-model = genai.GenerativeModel('gemini-pro')
+llm_client.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+MODEL_NAME = 'gemini-pro'
+# Bump whenever the prompt below changes so cached answers are not reused
+JD_MATCH_PROMPT_VERSION = "jd-match-v2"
+# A single resume/JD pair has nothing to prefilter, so there is no "hybrid" here
+JD_MATCH_MODES = ("llm", "local")
 
-def score_resume_against_jd(resume_text, jd_text):
-    prompt = f"""
+def score_resume_against_jd(resume_text, jd_text, mode="llm"):
+    if mode not in JD_MATCH_MODES:
+        raise ValueError(f"Unknown JD match mode: {mode} (expected one of {', '.join(JD_MATCH_MODES)})")
+    with metrics.timer("jd_match_seconds", mode=mode):
+        return _score_resume_against_jd(resume_text, jd_text, mode)
+
+def _score_resume_against_jd(resume_text, jd_text, mode):
+    # "Missing Keywords" is always computed locally; mode="local" skips Gemini entirely
+    with metrics.timer("local_score_seconds"):
+        local = local_scorer.score(resume_text, jd_text)
+    missing_section = f"• Missing Keywords: {', '.join(local['missing_keywords']) or 'None'}\n\n"
+    if mode == "local":
+        return f"• Job Description Match: {local['score']}%\n\n" + missing_section
+
+    key = cache_key(MODEL_NAME, JD_MATCH_PROMPT_VERSION, resume_text, jd_text)
+    response_text = response_cache.get(key)
+    if response_text is None:
+        prompt = f"""
     Resume: {resume_text}
     Job Description: {jd_text}
+    Keywords from the job description missing in the resume: {', '.join(local['missing_keywords']) or 'None'}
 
     I want the only response in 4 sectors as follows:
     • Job Description Match: \n\n
-    • Missing Keywords: \n\n
     • Profile Summary: \n\n
     • Personalized suggestions for skils, keywords and acheivements that can enhance the provided resume: \n\n
     • Application Success rates : \n\n
     """
 
-    response = model.generate_content(prompt)
-    return response.text
\ No newline at end of file
+        response_text = llm_client.generate(prompt, MODEL_NAME, priority=PRIORITY_INTERACTIVE)
+        response_cache.set(key, response_text)
+
+    # Put the locally computed section back where the LLM used to write it
+    if "• Profile Summary" in response_text:
+        return response_text.replace("• Profile Summary", missing_section + "• Profile Summary", 1)
+    return response_text + "\n\n" + missing_section
@@ -0,0 +1,267 @@
+# batch_rank.py
+# Bulk mode: rank a whole cohort of resumes against one shared pool of listings
+# in a single run, instead of one skill_extractor.py launch (and scrape) per resume.
+#
+#   python batch_rank.py resumes/ --output ranked.csv
+#   python batch_rank.py manifest.txt --output ranked.parquet --mode local
+#
+# The input is a directory of PDFs or a manifest: one PDF path per line
+# (relative paths are relative to the manifest, "#" starts a comment).
+#
+#   1. extract:  PDFs are parsed and their skills extracted on a process pool
+#                (resumes already in the resume cache are not parsed again)
+#   2. listings: the cohort's skills, most common first, are grouped into a few
+#                searches (BATCH_SEARCH_SKILLS skills each, at most BATCH_MAX_SEARCHES)
+#                run against every job source; listings are deduped across searches
+#   3. scoring:  LocalScorer.score_matrix scores every resume against every listing
+#                in one go; in hybrid mode each resume's top --top-k listings are
+#                then re-scored by Gemini, a few resumes at a time
+#   4. output:   each resume's best --per-resume listings, one row per pair, as CSV
+#                (or Parquet when --output ends in .parquet; needs pyarrow)
+#
+# Progress goes to stderr; a JSON summary is printed on stdout at the end.
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import skill_extractor as se
+from debug_log import log_to_csv
+from metrics import metrics
+
+BATCH_SEARCH_SKILLS = int(os.getenv("BATCH_SEARCH_SKILLS", "3"))
+BATCH_MAX_SEARCHES = int(os.getenv("BATCH_MAX_SEARCHES", "10"))
+BATCH_LLM_WORKERS = int(os.getenv("BATCH_LLM_WORKERS", "4"))
+BATCH_MODES = ("local", "hybrid")
+
+OUTPUT_FIELDS = ["resume", "rank", "title", "company", "location", "stipend", "link", "apply", "source",
+                 "ats", "score_source", "local_score", "llm_score", "matched_skills"]
+
+
+def find_resumes(input_path):
+    if os.path.isdir(input_path):
+        return sorted(os.path.join(input_path, name) for name in os.listdir(input_path)
+                      if name.lower().endswith(".pdf"))
+    base_dir = os.path.dirname(os.path.abspath(input_path))
+    with open(input_path, encoding="utf-8") as f:
+        lines = [line.split("#", 1)[0].strip() for line in f]
+    paths = [line if os.path.isabs(line) else os.path.join(base_dir, line) for line in lines if line]
+    return list(dict.fromkeys(paths))
+
+
+def report_progress(stage, done, total):
+    # About 20 lines per stage, however large the cohort
+    if done == total or done % max(1, total // 20) == 0:
+        sys.stderr.write(f"[{stage}] {done}/{total}\n")
+        sys.stderr.flush()
+
+
+def _extract(pdf_path, refresh=False):
+    try:
+        text, skills, _ = se.parse_resume(pdf_path, refresh)
+        return pdf_path, text, skills, None
+    except Exception as e:
+        return pdf_path, None, None, f"{type(e).__name__}: {e}"
+
+
+def extract_all(pdf_paths, workers=None, refresh=False):
+    # -> [(pdf_path, text, skills, error)] in input order
+    se.preload()  # loaded once here, inherited by the forked workers
+    results = {}
+    with multiprocessing.Pool(workers or os.cpu_count() or 1) as pool:
+        for done, result in enumerate(pool.imap_unordered(partial(_extract, refresh=refresh), pdf_paths), 1):
+            results[result[0]] = result
+            report_progress("extract", done, len(pdf_paths))
+    return [results[path] for path in pdf_paths]
+
+
+def search_groups(skill_lists, group_size=BATCH_SEARCH_SKILLS, max_searches=BATCH_MAX_SEARCHES):
+    # The cohort's skills by how many resumes list them, cut into small searches.
+    # Each group is sorted so the same skills give the same listing-store key next run.
+    counts = Counter(skill for skills in skill_lists for skill in set(skills))
+    ranked = [skill for skill, _ in counts.most_common()]
+    return [sorted(ranked[i:i + group_size]) for i in range(0, len(ranked), group_size)][:max_searches]
+
+
+def fetch_shared_listings(groups, listing_limit=None, eligible_limit=None):
+    # One fan-out per skill group, all on the shared session; -> [(record, job_description)]
+    # deduped by company + title, earlier (more common) groups first
+    from job_sources import configured_sources, dedupe_key, fan_out
+    sources = configured_sources()
+    session = se.get_http()
+    listings = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(len(groups), 4))) as executor:
+        futures = [executor.submit(fan_out, sources, group, session, listing_limit, eligible_limit)
+                   for group in groups]
+        for done, future in enumerate(futures, 1):
+            found, _ = future.result()
+            for _, _, job_data, job_desc in found:
+                key = dedupe_key(job_data)
+                if key not in listings:
+                    listings[key] = (job_data, job_desc)
+            report_progress("listings", done, len(groups))
+    return list(listings.values())
+
+
+def llm_rescore(resumes, top_indices, listings, workers=BATCH_LLM_WORKERS):
+    # Gemini scores for each resume's top listings: [{listing index: score}], one dict per resume.
+    # A failed resume keeps its local scores.
+    def rescore(i):
+        text = resumes[i][1]
+        indices = top_indices[i]
+        try:
+            scores = se.get_ats_scores(text, [listings[j][1] for j in indices])
+        except Exception as e:
+            log_to_csv("Batch ATS Scoring Error", f"{resumes[i][0]}: {e}")
+            sys.stderr.write(f"ATS scoring failed for {resumes[i][0]} ({se.gemini_error_type(e) or 'Error'}): {e}\n")
+            return {}
+        return dict(zip(indices, scores))
+
+    llm_scores = [None] * len(resumes)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {executor.submit(rescore, i): i for i in range(len(resumes))}
+        for done, future in enumerate(futures, 1):
+            llm_scores[futures[future]] = future.result()
+            report_progress("llm", done, len(resumes))
+    return llm_scores
+
+
+def rank_rows(pdf_path, resume_skills, candidates, local_scores, llm_scores, listings, listing_skills):
+    rows = []
+    for j in candidates:
+        job_data, _ = listings[j]
+        llm_score = llm_scores.get(j)
+        rows.append({
+            "resume": pdf_path,
+            "title": job_data["title"],
+            "company": job_data["company"],
+            "location": job_data["location"],
+            "stipend": job_data["stipend"],
+            "link": job_data["link"],
+            "apply": job_data["apply_link"],
+            "source": job_data["source"],
+            "ats": llm_score if llm_score is not None else int(local_scores[j]),
+            "score_source": "llm" if llm_score is not None else "local",
+            "local_score": int(local_scores[j]),
+            "llm_score": llm_score,
+            "matched_skills": ", ".join(sorted(listing_skills[j] & set(resume_skills))),
+        })
+    # Same order as skill_extractor's hybrid mode: Gemini-scored first, then score, then stipend
+    rows.sort(key=lambda row: (row["score_source"] == "llm", row["ats"], se.parse_stipend(row["stipend"])),
+              reverse=True)
+    for rank, row in enumerate(rows, 1):
+        row["rank"] = rank
+    return rows
+
+
+def write_rows(rows, output_path):
+    if output_path.endswith(".parquet"):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        pq.write_table(pa.table({field: [row[field] for row in rows] for field in OUTPUT_FIELDS}), output_path)
+        return
+    with open(output_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=OUTPUT_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def run_batch(pdf_paths, output_path, mode="hybrid", top_k=se.HYBRID_TOP_K, per_resume=se.top_n, workers=None,
+              llm_workers=BATCH_LLM_WORKERS, refresh=False):
+    from local_scorer import local_scorer
+    import numpy as np
+
+    timings = {}
+    stage_start = time.perf_counter()
+    extracted = extract_all(pdf_paths, workers, refresh)
+    resumes = [r for r in extracted if r[3] is None]
+    failed = [{"resume": path, "error": error} for path, _, _, error in extracted if error is not None]
+    for entry in failed:
+        log_to_csv("Batch Extraction Failed", f"{entry['resume']}: {entry['error']}")
+    timings["extract"] = round(time.perf_counter() - stage_start, 3)
+
+    stage_start = time.perf_counter()
+    groups = search_groups([skills for _, _, skills, _ in resumes])
+    listings = fetch_shared_listings(groups, se.INITIAL_SCRAPE_LIMIT, se.PREFILTER_LIMIT) if groups else []
+    timings["listings"] = round(time.perf_counter() - stage_start, 3)
+    sys.stderr.write(f"{len(listings)} listings from {len(groups)} searches for {len(resumes)} resumes\n")
+
+    stage_start = time.perf_counter()
+    local_scores = local_scorer.score_matrix([text for _, text, _, _ in resumes],
+                                             [job_desc for _, job_desc in listings],
+                                             [skills for _, _, skills, _ in resumes])
+    # Stable sort: equal scores keep listing order
+    candidates = [list(np.argsort(-row, kind="stable")[:per_resume]) for row in local_scores]
+    timings["local_scoring"] = round(time.perf_counter() - stage_start, 3)
+
+    stage_start = time.perf_counter()
+    if mode == "hybrid" and listings and top_k > 0:
+        llm_scores = llm_rescore(resumes, [indices[:top_k] for indices in candidates], listings, llm_workers)
+    else:
+        llm_scores = [{} for _ in resumes]
+    timings["llm_scoring"] = round(time.perf_counter() - stage_start, 3)
+
+    stage_start = time.perf_counter()
+    listing_skills = [local_scorer.skills_in(job_desc) for _, job_desc in listings]
+    rows = []
+    for i, (pdf_path, _, skills, _) in enumerate(resumes):
+        rows.extend(rank_rows(pdf_path, skills, candidates[i], local_scores[i], llm_scores[i], listings,
+                              listing_skills))
+    write_rows(rows, output_path)
+    timings["output"] = round(time.perf_counter() - stage_start, 3)
+
+    for stage, seconds in timings.items():
+        metrics.observe("stage_seconds", seconds, stage=f"batch_{stage}")
+    log_to_csv("Batch Stage Timings", json.dumps(timings))
+    return {
+        "resumes": len(pdf_paths),
+        "ranked": len(resumes),
+        "failed": failed,
+        "searches": len(groups),
+        "listings": len(listings),
+        "rows": len(rows),
+        "output": output_path,
+        "timings": timings,
+        "llm": se.llm_client.metrics(),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rank a directory or manifest of resume PDFs against one shared set of listings.")
+    parser.add_argument("input", help="directory of resume PDFs, or a manifest file with one PDF path per line")
+    parser.add_argument("--output", required=True, help="CSV file to write (or .parquet, needs pyarrow)")
+    parser.add_argument("--mode", choices=BATCH_MODES, default="hybrid",
+                        help="local: LocalScorer only; hybrid: Gemini re-scores each resume's top-k (default)")
+    parser.add_argument("--top-k", type=int, default=se.HYBRID_TOP_K,
+                        help="listings per resume re-scored by Gemini in hybrid mode (default: $HYBRID_TOP_K or 5)")
+    parser.add_argument("--per-resume", type=int, default=se.top_n, help="rows written per resume (default: 10)")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("EXTRACTOR_WORKERS", "0")) or None,
+                        help="PDF extraction processes (default: CPU count)")
+    parser.add_argument("--llm-workers", type=int, default=BATCH_LLM_WORKERS,
+                        help="resumes scored by Gemini concurrently (default: $BATCH_LLM_WORKERS or 4)")
+    parser.add_argument("--refresh", action="store_true", help="reparse every PDF instead of using the resume cache")
+    args = parser.parse_args()
+
+    if args.output.endswith(".parquet"):
+        try:
+            import pyarrow.parquet  # noqa: F401
+        except ImportError:
+            parser.error("Parquet output needs pyarrow (pip install pyarrow); use a .csv output instead")
+    if not os.path.exists(args.input):
+        parser.error(f"{args.input} does not exist")
+    pdf_paths = find_resumes(args.input)
+    if not pdf_paths:
+        parser.error(f"no resume PDFs found in {args.input}")
+
+    summary = run_batch(pdf_paths, args.output, mode=args.mode, top_k=args.top_k, per_resume=args.per_resume,
+                        workers=args.workers, llm_workers=args.llm_workers, refresh=args.refresh)
+    metrics.write_textfile()
+    sys.stdout.write(json.dumps(summary, indent=2) + "\n")
+    if not summary["ranked"]:
+        sys.exit(1)
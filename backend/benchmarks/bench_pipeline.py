@@ -0,0 +1,234 @@
+# bench_pipeline.py
+# Offline end-to-end benchmark of the resume -> internships pipeline:
+# extract_text_from_pdf, extract_skills, scrape_internships (job sources, prefilter,
+# ATS scoring) and the Gemini calls behind get_ats_score/get_ats_scores.
+#
+#   python benchmarks/bench_pipeline.py [--concurrency 1,2,4] [--jobs 10]
+#       [--llm-latency 0.3] [--llm-429-rate 0.05] [--resumes DIR] [--output run.json]
+#
+# - Resumes: the PDFs in --resumes, or PDFs rendered from fixtures/resumes/*.txt.
+# - Internshala: fixture_server.py serving the saved search/detail HTML.
+# - Gemini: a stub GenerativeModel with fixed latency (plus jitter) that raises
+#   ResourceExhausted on a configurable share of calls, so llm_client's backoff
+#   and circuit breaker are exercised as well.
+# Jobs run on a forked process pool, like skill_extractor --serve, once per
+# concurrency level. The JSON report has per-stage p50/p95, throughput and
+# peak RSS, so runs can be diffed across commits.
+import argparse
+import glob
+import json
+import math
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+RESUME_FIXTURES = os.path.join(BENCH_DIR, "fixtures", "resumes")
+STAGES = ["pdf", "skills", "sources", "prefilter", "scoring", "total"]
+
+# Set up by configure() before the pool forks, inherited by every worker
+_config = {}
+_llm_calls = {"calls": 0, "injected_429": 0, "latencies": []}
+
+
+def peak_rss_mb(who=resource.RUSAGE_SELF):
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    rss = resource.getrusage(who).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def percentile(values, pct):
+    # Nearest-rank percentile
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def render_resume_pdfs(out_dir, fixtures_dir=RESUME_FIXTURES):
+    import fitz
+    paths = []
+    for text_path in sorted(glob.glob(os.path.join(fixtures_dir, "*.txt"))):
+        with open(text_path, encoding="utf-8") as f:
+            text = f.read()
+        doc = fitz.open()
+        page = doc.new_page()
+        page.insert_textbox(fitz.Rect(50, 50, page.rect.width - 50, page.rect.height - 50), text, fontsize=9)
+        pdf_path = os.path.join(out_dir, os.path.basename(text_path)[:-4] + ".pdf")
+        doc.save(pdf_path)
+        doc.close()
+        paths.append(pdf_path)
+    return paths
+
+
+class StubResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class StubGenerativeModel:
+    # Stands in for genai.GenerativeModel: answers single and batched ATS prompts
+    def __init__(self, model_name):
+        self.model_name = model_name
+
+    def generate_content(self, prompt):
+        from google.api_core.exceptions import ResourceExhausted
+
+        start = time.perf_counter()
+        latency = _config["llm_latency"]
+        time.sleep(max(0.0, random.uniform(latency * 0.8, latency * 1.2)))
+        _llm_calls["calls"] += 1
+        _llm_calls["latencies"].append(time.perf_counter() - start)
+        if random.random() < _config["llm_429_rate"]:
+            _llm_calls["injected_429"] += 1
+            raise ResourceExhausted("429 Resource has been exhausted (injected by bench_pipeline)")
+
+        jobs = prompt.count("\nJob ")
+        if jobs > 1:
+            return StubResponse(json.dumps([random.randint(30, 95) for _ in range(jobs)]))
+        return StubResponse(str(random.randint(30, 95)))
+
+
+def configure(args, base_url, tmp_dir):
+    # Environment must be in place before skill_extractor (and its shared clients) is imported
+    os.environ["INTERNSHALA_BASE_URL"] = base_url
+    os.environ["LLM_RPM"] = str(args.llm_rpm)
+    # A budget of its own, so stubbed calls at --llm-rpm don't draw down the real one
+    os.environ["LLM_BUDGET_PATH"] = os.path.join(tmp_dir, "llm_budget.sqlite")
+    if not args.warm:
+        os.environ["RESPONSE_CACHE_DISABLED"] = "1"
+        os.environ["LISTING_STORE_DISABLED"] = "1"
+    _config.update(llm_latency=args.llm_latency, llm_429_rate=args.llm_429_rate, mode=args.mode)
+    sys.path.insert(0, BACKEND_DIR)
+
+    import google.generativeai as genai
+    genai.GenerativeModel = StubGenerativeModel
+    import skill_extractor
+    # Like --serve: load models in the parent so forked workers start warm
+    skill_extractor.preload()
+    # The real backoff waits seconds; keep retries visible but short
+    skill_extractor.llm_client.base_delay = args.llm_backoff
+    skill_extractor.llm_client.max_delay = args.llm_backoff * 8
+
+
+def _init_worker():
+    random.seed(os.getpid())
+
+
+def run_job(pdf_path):
+    import skill_extractor as se
+
+    _llm_calls.update(calls=0, injected_429=0, latencies=[])
+    timings = {}
+    error = None
+    start = time.perf_counter()
+    try:
+        stage_start = time.perf_counter()
+        text = se.extract_text_from_pdf(pdf_path)
+        timings["pdf"] = time.perf_counter() - stage_start
+
+        stage_start = time.perf_counter()
+        skills = se.extract_skills(text)
+        timings["skills"] = time.perf_counter() - stage_start
+
+        stage_timings = {}
+        se.scrape_internships(skills, text, num_to_score=se.top_n, initial_scrape_limit=se.INITIAL_SCRAPE_LIMIT,
+                              mode=_config["mode"], stage_timings=stage_timings)
+        timings.update(stage_timings)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    timings["total"] = time.perf_counter() - start
+    return {"timings": timings, "error": error, "llm": dict(_llm_calls)}
+
+
+def run_level(pdf_paths, concurrency, jobs):
+    work = [pdf_paths[i % len(pdf_paths)] for i in range(jobs)]
+    ctx = multiprocessing.get_context("fork")
+    start = time.perf_counter()
+    with ctx.Pool(concurrency, initializer=_init_worker) as pool:
+        results = pool.map(run_job, work, chunksize=1)
+    wall = time.perf_counter() - start
+
+    stages = {}
+    for stage in STAGES:
+        values = [r["timings"][stage] for r in results if stage in r["timings"]]
+        if values:
+            stages[stage] = {
+                "p50_ms": round(percentile(values, 50) * 1000, 1),
+                "p95_ms": round(percentile(values, 95) * 1000, 1),
+                "mean_ms": round(sum(values) / len(values) * 1000, 1),
+            }
+    llm_latencies = [latency for r in results for latency in r["llm"]["latencies"]]
+    errors = [r["error"] for r in results if r["error"]]
+    return {
+        "concurrency": concurrency,
+        "jobs": jobs,
+        "wall_s": round(wall, 3),
+        "throughput_jobs_per_s": round(jobs / wall, 3),
+        "stages": stages,
+        "llm": {
+            "calls": sum(r["llm"]["calls"] for r in results),
+            "injected_429": sum(r["llm"]["injected_429"] for r in results),
+            "p50_ms": round(percentile(llm_latencies, 50) * 1000, 1) if llm_latencies else None,
+            "p95_ms": round(percentile(llm_latencies, 95) * 1000, 1) if llm_latencies else None,
+        },
+        "errors": len(errors),
+        "error_samples": sorted(set(errors))[:3],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline end-to-end benchmark of the resume-to-internships pipeline.")
+    parser.add_argument("--resumes", help="directory of resume PDFs (default: rendered from fixtures/resumes)")
+    parser.add_argument("--concurrency", default="1,2,4", help="comma-separated worker counts")
+    parser.add_argument("--jobs", type=int, default=10, help="resumes processed per concurrency level")
+    parser.add_argument("--mode", default="llm", choices=["llm", "local", "hybrid"])
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="stub Gemini seconds per call")
+    parser.add_argument("--llm-429-rate", type=float, default=0.05, help="share of stub calls failing with 429")
+    parser.add_argument("--llm-backoff", type=float, default=0.05, help="llm_client base backoff in seconds")
+    parser.add_argument("--llm-rpm", type=float, default=100000, help="llm_client requests/minute budget")
+    parser.add_argument("--http-latency", type=float, default=0.02, help="fixture server seconds per request")
+    parser.add_argument("--warm", action="store_true", help="keep the response cache and listing store enabled")
+    parser.add_argument("--output", help="also write the JSON report here")
+    args = parser.parse_args()
+
+    sys.path.insert(0, BENCH_DIR)
+    from fixture_server import start_fixture_server
+
+    server, base_url = start_fixture_server(latency=args.http_latency)
+    tmp_dir = tempfile.TemporaryDirectory()
+    try:
+        if args.resumes:
+            pdf_paths = sorted(glob.glob(os.path.join(args.resumes, "*.pdf")))
+        else:
+            pdf_paths = render_resume_pdfs(tmp_dir.name)
+        if not pdf_paths:
+            parser.error("no resume PDFs found")
+
+        start = time.perf_counter()
+        configure(args, base_url, tmp_dir.name)
+        import_s = time.perf_counter() - start
+
+        levels = [run_level(pdf_paths, int(n), args.jobs) for n in args.concurrency.split(",")]
+    finally:
+        server.shutdown()
+        tmp_dir.cleanup()
+
+    report = {
+        "config": {key: value for key, value in vars(args).items() if key != "output"},
+        "resumes": len(pdf_paths),
+        "import_s": round(import_s, 3),
+        "levels": levels,
+        "peak_rss_mb": {"parent": round(peak_rss_mb(), 1),
+                        "worker": round(peak_rss_mb(resource.RUSAGE_CHILDREN), 1)},
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,117 @@
+# bench_skill_matcher.py
+# Micro-benchmark: compiled SkillMatcher vs. the old per-keyword regex loop.
+#
+#   python benchmarks/bench_skill_matcher.py [--docs 200] [--taxonomy-size 20000]
+#
+# Both engines run on the same cleaned text (what extract_skills feeds them after
+# spaCy/stopword filtering), results are checked for equality, and timings are
+# printed as JSON.
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skill_keywords import SKILL_KEYWORDS  # noqa: E402
+from skill_matcher import SkillMatcher  # noqa: E402
+
+FILLER = (
+    "built deployed maintained team project internship university pipeline api "
+    "dashboard scalable users latency model dataset research web app service "
+    "ai/ml c++17 node react native mobile data science learning machine"
+).split()
+
+
+def boundary_pattern(skill):
+    # SkillMatcher's boundary rule: \b next to a word character, whitespace or the
+    # end of the text next to punctuation ("c++", ".net core")
+    before = r'\b' if re.match(r'\w', skill) else r'(?<!\S)'
+    after = r'\b' if re.search(r'\w$', skill) else r'(?!\S)'
+    return before + re.escape(skill) + after
+
+
+def legacy_match(text_clean, keywords):
+    # The loop extract_skills used before SkillMatcher
+    found = set()
+    for skill in sorted(keywords, key=len, reverse=True):
+        pattern = boundary_pattern(skill)
+        if re.search(pattern, text_clean):
+            found.add(skill)
+            text_clean = re.sub(pattern, '', text_clean)
+    return found
+
+
+def make_docs(keywords, count, words_per_doc, seed=7):
+    rng = random.Random(seed)
+    docs = []
+    for _ in range(count):
+        words = []
+        while len(words) < words_per_doc:
+            if rng.random() < 0.15:
+                words.extend(rng.choice(keywords).split())
+            else:
+                words.append(rng.choice(FILLER))
+        docs.append(" ".join(words))
+    return docs
+
+
+def make_taxonomy(size, seed=11):
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    synthetic = set(SKILL_KEYWORDS)
+    while len(synthetic) < size:
+        parts = ["".join(rng.choice(letters) for _ in range(rng.randint(3, 9)))
+                 for _ in range(rng.randint(1, 3))]
+        synthetic.add(" ".join(parts))
+    return list(synthetic)
+
+
+def time_per_doc(fn, docs):
+    start = time.perf_counter()
+    results = [fn(doc) for doc in docs]
+    return (time.perf_counter() - start) / len(docs) * 1000, results
+
+
+def run(keywords, docs, legacy_docs):
+    build_start = time.perf_counter()
+    matcher = SkillMatcher(keywords)
+    build_ms = (time.perf_counter() - build_start) * 1000
+
+    matcher_ms, matcher_results = time_per_doc(matcher.find, docs)
+    legacy_ms, legacy_results = time_per_doc(lambda doc: legacy_match(doc, keywords), legacy_docs)
+    mismatches = sum(1 for a, b in zip(matcher_results, legacy_results) if a != b)
+
+    return {
+        "skills": len(keywords),
+        "build_ms": round(build_ms, 2),
+        "matcher_ms_per_doc": round(matcher_ms, 3),
+        "legacy_ms_per_doc": round(legacy_ms, 3),
+        "speedup": round(legacy_ms / matcher_ms, 1) if matcher_ms else None,
+        "legacy_docs_checked": len(legacy_docs),
+        "mismatches": mismatches,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark SkillMatcher against the per-keyword regex loop.")
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--words", type=int, default=600, help="words per synthetic resume")
+    parser.add_argument("--taxonomy-size", type=int, default=20000)
+    parser.add_argument("--legacy-docs", type=int, default=10,
+                        help="docs to run through the legacy loop on the large taxonomy (it is slow)")
+    args = parser.parse_args()
+
+    docs = make_docs(SKILL_KEYWORDS, args.docs, args.words)
+    report = {"current_list": run(SKILL_KEYWORDS, docs, docs)}
+
+    taxonomy = make_taxonomy(args.taxonomy_size)
+    large_docs = make_docs(taxonomy, args.docs, args.words)
+    report["large_taxonomy"] = run(taxonomy, large_docs, large_docs[:args.legacy_docs])
+
+    print(json.dumps(report, indent=2))
+    if any(section["mismatches"] for section in report.values()):
+        sys.exit(1)
@@ -0,0 +1,98 @@
+# bench_spacy_modes.py
+# Compares the spaCy modes used by extract_skills: the full en_core_web_sm
+# pipeline vs. tokenizer-only, each with per-document nlp() calls and with the
+# batched extract_skills_many (nlp.pipe).
+#
+#   python benchmarks/bench_spacy_modes.py [--docs 200] [--n-process 1]
+#
+# Every mode runs in a fresh interpreter so peak RSS is measured independently.
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODES = ["full", "tokenizer"]
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def run_child(mode, docs, words, n_process, batch_size):
+    os.environ["SPACY_MODE"] = mode
+    sys.path.insert(0, BACKEND_DIR)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    start = time.perf_counter()
+    import skill_extractor
+    skill_extractor.get_nlp()
+    load_s = time.perf_counter() - start
+
+    from bench_skill_matcher import make_docs
+    from skill_keywords import SKILL_KEYWORDS
+    texts = make_docs(SKILL_KEYWORDS, docs, words)
+
+    start = time.perf_counter()
+    single = [skill_extractor.extract_skills(text) for text in texts]
+    single_ms = (time.perf_counter() - start) / len(texts) * 1000
+
+    start = time.perf_counter()
+    batched = skill_extractor.extract_skills_many(texts, n_process=n_process, batch_size=batch_size)
+    batched_ms = (time.perf_counter() - start) / len(texts) * 1000
+
+    return {
+        "mode": mode,
+        "pipes": skill_extractor.get_nlp().pipe_names,
+        "load_s": round(load_s, 3),
+        "ms_per_doc": round(single_ms, 3),
+        "ms_per_doc_batched": round(batched_ms, 3),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "same_skills": [sorted(a) for a in single] == [sorted(b) for b in batched],
+        "skills": [sorted(a) for a in single],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark full vs. tokenizer-only spaCy for extract_skills.")
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--words", type=int, default=600)
+    parser.add_argument("--n-process", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        result = run_child(args.child, args.docs, args.words, args.n_process, args.batch_size)
+        sys.stdout.write("\n" + json.dumps(result) + "\n")
+        sys.exit(0)
+
+    results = {}
+    for mode in MODES:
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", mode,
+             "--docs", str(args.docs), "--words", str(args.words),
+             "--n-process", str(args.n_process), "--batch-size", str(args.batch_size)],
+            capture_output=True, text=True, check=True,
+        )
+        # Some imports print warnings to stdout, so the report is the last line
+        results[mode] = json.loads(out.stdout.strip().splitlines()[-1])
+
+    full, lite = results["full"], results["tokenizer"]
+    report = {
+        mode: {key: value for key, value in result.items() if key != "skills"}
+        for mode, result in results.items()
+    }
+    report["savings_vs_full"] = {
+        "ms_per_doc": round(full["ms_per_doc"] - lite["ms_per_doc"], 3),
+        "ms_per_doc_batched": round(full["ms_per_doc"] - lite["ms_per_doc_batched"], 3),
+        "peak_rss_mb": round(full["peak_rss_mb"] - lite["peak_rss_mb"], 1),
+        "speedup": round(full["ms_per_doc"] / lite["ms_per_doc_batched"], 1) if lite["ms_per_doc_batched"] else None,
+        "same_skills": full["skills"] == lite["skills"],
+    }
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,94 @@
+# bench_startup.py
+# Wall-clock startup of the Python entry points on their cheap paths, each run
+# in a fresh interpreter:
+#
+#   skill_extractor --help, with no arguments (usage error) and with a missing
+#   PDF (error JSON); resume.py with invalid input and with a cached summary.
+#
+#   python benchmarks/bench_startup.py [--runs 10] [--backend-dir DIR]
+#
+# --backend-dir points at another checkout's backend/ to compare against, e.g.
+#   git worktree add /tmp/before HEAD~1
+#   python benchmarks/bench_startup.py --backend-dir /tmp/before/backend
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SAMPLE_SUMMARY_INPUT = {
+    "name": "Aarav Mehta",
+    "goal": "Machine learning internship",
+    "skills": ["Python", "PyTorch", "SQL"],
+    "education": [{"degree": "B.Tech CSE", "institution": "DTU", "year": "2026"}],
+    "experience": [{"role": "Research Intern", "company": "Vision Lab", "year": "2024",
+                    "description": "Trained image classifiers"}],
+    "projects": [{"title": "Resume Ranker", "description": "Ranks resumes against job descriptions"}],
+}
+
+
+def seed_summary_cache(cache_path):
+    # Store a summary under the key resume.py will look up, so its run never calls Gemini
+    os.environ["RESPONSE_CACHE_PATH"] = cache_path
+    sys.path.insert(0, BACKEND_DIR)
+    import resume
+    from response_cache import ResponseCache, cache_key
+
+    data = SAMPLE_SUMMARY_INPUT
+    prompt = resume.build_prompt(data["name"], data["goal"], data["skills"], data["education"],
+                                 data["experience"], data["projects"])
+    ResponseCache(cache_path).set(cache_key(resume.MODEL_NAME, resume.SUMMARY_PROMPT_VERSION, prompt),
+                                  ["I am a cached summary."])
+
+
+def scenarios():
+    summary_input = json.dumps(SAMPLE_SUMMARY_INPUT)
+    return {
+        "skill_extractor_help": (["skill_extractor.py", "--help"], None),
+        "skill_extractor_usage_error": (["skill_extractor.py"], None),
+        "skill_extractor_missing_pdf": (["skill_extractor.py", "/nonexistent/resume.pdf"], None),
+        "resume_invalid_input": (["resume.py"], "not json"),
+        "resume_cached_summary": (["resume.py"], summary_input),
+    }
+
+
+def time_run(backend_dir, argv, stdin, env):
+    start = time.perf_counter()
+    subprocess.run([sys.executable] + argv, cwd=backend_dir, input=stdin, env=env,
+                   capture_output=True, text=True)
+    return time.perf_counter() - start
+
+
+def bench(backend_dir, runs, env):
+    results = {}
+    for name, (argv, stdin) in scenarios().items():
+        times = [time_run(backend_dir, argv, stdin, env) for _ in range(runs)]
+        results[name] = {"median_ms": round(statistics.median(times) * 1000, 1),
+                         "min_ms": round(min(times) * 1000, 1)}
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark startup time of the Python entry points.")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--backend-dir", help="another checkout's backend/ to compare against")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_path = os.path.join(tmp_dir, "responses.sqlite")
+        seed_summary_cache(cache_path)
+        env = dict(os.environ, RESPONSE_CACHE_PATH=cache_path, LISTING_STORE_DISABLED="1")
+
+        report = {"current": bench(BACKEND_DIR, args.runs, env)}
+        if args.backend_dir:
+            report["baseline"] = bench(os.path.abspath(args.backend_dir), args.runs, env)
+            report["speedup"] = {
+                name: round(report["baseline"][name]["median_ms"] / result["median_ms"], 1)
+                for name, result in report["current"].items() if result["median_ms"]
+            }
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,103 @@
+# check_sources.py
+# Offline checks for the job-source adapters in job_sources.py.
+#
+#   python benchmarks/check_sources.py
+#
+# 1. Parsing: every registered adapter must have fixtures under
+#    fixtures/<source name>/ (search.html + detail/*.html); each search page has
+#    to yield complete records and each detail page a job description.
+# 2. Fan-out (against fixture_server.py): the same board registered twice is
+#    deduped to one set of listings, and a source slower than its deadline is
+#    dropped without holding up the others.
+# Prints a JSON report and exits non-zero if any check fails.
+import glob
+import json
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+os.environ.setdefault("LISTING_STORE_DISABLED", "1")
+
+import job_sources  # noqa: E402
+from fixture_server import start_fixture_server  # noqa: E402
+from http_pool import PooledSession  # noqa: E402
+
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures")
+RECORD_FIELDS = ("source", "title", "company", "location", "stipend", "link", "apply_link")
+
+
+def check_parsing(name, source_class):
+    fixtures = os.path.join(FIXTURES_DIR, name)
+    source = source_class()
+    with open(os.path.join(fixtures, "search.html"), encoding="utf-8") as f:
+        records = source.parse_listing_page(f.read())
+    details = {}
+    for path in sorted(glob.glob(os.path.join(fixtures, "detail", "*.html"))):
+        with open(path, encoding="utf-8") as f:
+            details[os.path.basename(path)] = source.parse_detail_page(f.read())
+    problems = [f"record {i} missing {field}" for i, record in enumerate(records)
+                for field in RECORD_FIELDS if not record.get(field)]
+    problems += [f"{page} has no job description" for page, (_, job_desc) in details.items() if not job_desc]
+    if not records:
+        problems.append("search page yielded no records")
+    return {
+        "records": len(records),
+        "detail_pages": len(details),
+        "eligible": sum(1 for eligible, _ in details.values() if eligible),
+        "problems": problems,
+    }
+
+
+def check_fan_out():
+    fast_server, fast_url = start_fixture_server()
+    slow_server, slow_url = start_fixture_server(latency=1.0)
+    session = PooledSession()
+
+    class MirrorSource(job_sources.InternshalaSource):
+        name = "internshala_mirror"
+
+    class SlowSource(job_sources.InternshalaSource):
+        name = "internshala_slow"
+
+    try:
+        skills = ["python", "machine learning"]
+        single, single_listed = job_sources.fan_out([job_sources.InternshalaSource(fast_url)], skills, session)
+
+        start = time.monotonic()
+        timings = {}
+        merged, merged_listed = job_sources.fan_out(
+            [job_sources.InternshalaSource(fast_url), MirrorSource(fast_url), SlowSource(slow_url, deadline=0.5)],
+            skills, session, stage_timings=timings)
+        elapsed = time.monotonic() - start
+    finally:
+        fast_server.shutdown()
+        slow_server.shutdown()
+
+    problems = []
+    if not single:
+        problems.append("no eligible listings from the fixture board")
+    if [job["link"] for _, _, job, _ in merged] != [job["link"] for _, _, job, _ in single]:
+        problems.append("mirrored board was not deduped to the single-board listings")
+    if any(job["source"] != "internshala" for _, _, job, _ in merged):
+        problems.append("duplicates should keep the first source's record")
+    if elapsed > 0.5 + job_sources.SOURCE_GRACE + 1.0:
+        problems.append(f"slow source held the fan-out for {elapsed:.2f}s")
+    return {
+        "single_source": {"eligible": len(single), "listed": single_listed},
+        "three_sources": {"eligible": len(merged), "listed": merged_listed, "elapsed_s": round(elapsed, 3),
+                          "timings": timings},
+        "problems": problems,
+    }
+
+
+if __name__ == "__main__":
+    report = {"parsing": {}, "fan_out": None}
+    for name, source_class in job_sources.SOURCES.items():
+        report["parsing"][name] = check_parsing(name, source_class)
+    report["fan_out"] = check_fan_out()
+    print(json.dumps(report, indent=2))
+    failed = any(result["problems"] for result in report["parsing"].values()) or report["fan_out"]["problems"]
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,86 @@
+# fixture_server.py
+# Local stand-in for internshala.com that serves the saved HTML under
+# benchmarks/fixtures/internshala, so the scraper can be exercised offline:
+#
+#   python benchmarks/fixture_server.py --port 8765
+#   INTERNSHALA_BASE_URL=http://127.0.0.1:8765 python skill_extractor.py resume.pdf
+#
+#   /internships/<skills>-internship   -> search.html (any skills slug)
+#   /internship/detail/<slug>          -> detail/<slug>.html
+#
+# Responses carry Last-Modified (the file's mtime) and If-Modified-Since is
+# answered with 304, so the listing store's conditional refresh can be tested.
+import argparse
+import os
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "internshala")
+
+
+def make_handler(fixtures_dir=FIXTURES_DIR, latency=0.0):
+    class FixtureHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?", 1)[0]
+            if path.startswith("/internships/"):
+                file_path = os.path.join(fixtures_dir, "search.html")
+            elif path.startswith("/internship/detail/"):
+                slug = os.path.basename(path.rstrip("/"))
+                file_path = os.path.join(fixtures_dir, "detail", slug + ".html")
+            else:
+                file_path = None
+
+            if latency:
+                time.sleep(latency)
+            if not file_path or not os.path.isfile(file_path):
+                self.send_error(404)
+                return
+
+            mtime = int(os.path.getmtime(file_path))
+            since = self.headers.get("If-Modified-Since")
+            if since:
+                try:
+                    if parsedate_to_datetime(since).timestamp() >= mtime:
+                        self.send_response(304)
+                        self.end_headers()
+                        return
+                except (TypeError, ValueError):
+                    pass
+
+            with open(file_path, "rb") as f:
+                body = f.read()
+            self.send_response(200)
+            self.send_header("Last-Modified", formatdate(mtime, usegmt=True))
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return FixtureHandler
+
+
+def start_fixture_server(port=0, fixtures_dir=FIXTURES_DIR, latency=0.0):
+    # Starts the server on a background thread; returns (server, base_url)
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(fixtures_dir, latency))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve saved Internshala HTML for offline scraping.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds to delay every response")
+    args = parser.parse_args()
+
+    server, base_url = start_fixture_server(args.port, latency=args.latency)
+    print(f"Serving {FIXTURES_DIR} at {base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
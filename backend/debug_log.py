@@ -0,0 +1,15 @@
+# debug_log.py
+# The debug_log.csv event log shared by skill_extractor.py and job_sources.py.
+import csv
+import datetime
+import os
+
+
+def log_to_csv(event, details="", file_path="debug_log.csv"):
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    file_exists = os.path.isfile(file_path)
+    with open(file_path, mode="a", newline="") as file:
+        writer = csv.writer(file)
+        if not file_exists:
+            writer.writerow(["Timestamp", "Event", "Details"])
+        writer.writerow([timestamp, event, details])
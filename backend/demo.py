@@ -1,2 +1,38 @@
-import nltk
-nltk.download('stopwords', download_dir='nltk_data')
+# demo.py
+# Rebuilds stop_words_en.py, the prebuilt stopword frozenset imported by
+# skill_extractor.py and local_scorer.py, from the NLTK corpus in nltk_data/.
+# Nothing downloads stopwords at runtime; run this by hand when the list needs
+# refreshing (--download fetches the corpus into nltk_data/ first).
+#
+#   python demo.py [--download]
+import argparse
+import os
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+NLTK_DATA_DIR = os.path.join(BACKEND_DIR, "nltk_data")
+CORPUS_PATH = os.path.join(NLTK_DATA_DIR, "corpora", "stopwords", "english")
+OUTPUT_PATH = os.path.join(BACKEND_DIR, "stop_words_en.py")
+
+
+def build_stop_words_module(corpus_path=CORPUS_PATH, output_path=OUTPUT_PATH):
+    with open(corpus_path, encoding="utf-8") as f:
+        words = sorted({line.strip() for line in f if line.strip()})
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write("# stop_words_en.py\n")
+        f.write("# Generated by demo.py from nltk_data/corpora/stopwords/english; do not edit.\n")
+        f.write("STOP_WORDS = frozenset({\n")
+        for word in words:
+            f.write(f"    {word!r},\n")
+        f.write("})\n")
+    return len(words)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild stop_words_en.py from the NLTK stopwords corpus.")
+    parser.add_argument("--download", action="store_true", help="download the NLTK stopwords corpus first")
+    args = parser.parse_args()
+    if args.download:
+        import nltk
+        nltk.download("stopwords", download_dir=NLTK_DATA_DIR)
+    count = build_stop_words_module()
+    print(f"Wrote {count} stopwords to {OUTPUT_PATH}")
@@ -0,0 +1,54 @@
+# http_pool.py
+# Shared HTTP plumbing for the scrapers: one keep-alive requests.Session with a
+# sized connection pool, default timeouts and a per-host concurrency cap, so a
+# thread pool of fetchers can't hammer a single board.
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import metrics
+
+DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0"}
+DEFAULT_TIMEOUT = (5, 15)  # (connect, read) seconds
+MAX_PER_HOST = int(os.getenv("SCRAPE_MAX_PER_HOST", "4"))
+
+
+class PooledSession:
+    def __init__(self, max_per_host=MAX_PER_HOST, timeout=DEFAULT_TIMEOUT, pool_size=16):
+        self.timeout = timeout
+        self.max_per_host = max_per_host
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._host_limits = {}
+        self._lock = threading.Lock()
+
+    def _host_limit(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            limit = self._host_limits.get(host)
+            if limit is None:
+                limit = self._host_limits[host] = threading.BoundedSemaphore(self.max_per_host)
+        return limit
+
+    def get(self, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        with self._host_limit(url):
+            start = time.perf_counter()
+            status = "error"
+            try:
+                response = self.session.get(url, **kwargs)
+                status = response.status_code
+                return response
+            finally:
+                metrics.observe("http_request_seconds", time.perf_counter() - start,
+                                host=urlsplit(url).netloc, status=status)
+
+    def close(self):
+        self.session.close()
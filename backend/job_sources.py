@@ -0,0 +1,290 @@
+# job_sources.py
+# Job-board adapters behind one interface, searched concurrently.
+#
+# An adapter (JobSource subclass) only knows its board: the search URL for a
+# set of skills, how to parse a search page into listing records and a detail
+# page into (eligible, job description), and how to turn a listing link into an
+# apply link. Fetching is shared: search and detail pages go through the
+# listing store (freshness windows + conditional GETs) and detail pages are
+# downloaded on a thread pool.
+#
+# fan_out() searches every configured source (JOB_SOURCES) at once, each within
+# its own deadline (SOURCE_DEADLINE seconds), so one slow board only loses its
+# own listings. Results are deduped by company + title, first source wins.
+#
+# Listing records are plain dicts:
+#   {"source", "title", "company", "location", "stipend", "link", "apply_link", "ats_score"}
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from debug_log import log_to_csv
+from listing_store import listing_store
+from skill_taxonomy import skill_taxonomy
+
+INTERNSHALA_BASE_URL = os.getenv("INTERNSHALA_BASE_URL", "https://internshala.com")
+SCRAPE_WORKERS = int(os.getenv("SCRAPE_WORKERS", "8"))
+SOURCE_DEADLINE = float(os.getenv("SOURCE_DEADLINE", "20"))  # seconds per source
+# Extra time a source gets to hand back partial results after its deadline
+SOURCE_GRACE = 0.5
+
+
+def dedupe_key(job):
+    return re.sub(r"\s+", " ", f"{job['company']}|{job['title']}").strip().casefold()
+
+
+class JobSource:
+    name = None
+
+    def __init__(self, deadline=None):
+        self.deadline = deadline if deadline is not None else SOURCE_DEADLINE
+
+    # --- board specifics, implemented by each adapter ---
+
+    def search_url(self, skills):
+        raise NotImplementedError
+
+    def parse_listing_page(self, html, limit=None):
+        # -> list of records (see record())
+        raise NotImplementedError
+
+    def parse_detail_page(self, html):
+        # -> (eligible, job_description)
+        raise NotImplementedError
+
+    def apply_link(self, link):
+        return link
+
+    # --- shared plumbing ---
+
+    def search_key(self, skills):
+        # Canonical names in taxonomy order, so the same skills always give the same
+        # search URL (and listing-store entry) whatever order or spelling they came in
+        return ",".join(skill_taxonomy.ordered(skills)).replace(" ", "-").lower()
+
+    def record(self, title, company, location, stipend, link):
+        return {
+            "source": self.name,
+            "title": title,
+            "company": company,
+            "location": location,
+            "stipend": stipend,
+            "link": link,
+            "apply_link": self.apply_link(link),
+            "ats_score": None,
+        }
+
+    def _from_store(self, cards):
+        return [self.record(card["title"], card["company"], card["location"], card["stipend"], card["link"])
+                for card in cards]
+
+    def fetch_listings(self, skills, session, limit=None, degraded=None):
+        # ✅ Search results come from the listing store while fresh (LISTING_SEARCH_TTL);
+        # otherwise the page is re-fetched conditionally. Returns None if the search
+        # page can't be fetched and nothing is stored. Here and below, a failure that
+        # leaves the result incomplete is also appended to `degraded`, if given.
+        # Stored by full search URL: the same skills against another base URL (e.g. the
+        # fixture server) are a different search
+        url = self.search_url(skills)
+        cards = listing_store.get_search(self.name, url)
+        if cards is not None:
+            log_to_csv("Listings From Store", f"URL: {url}")
+            return self._from_store(cards)[:limit]
+        try:
+            response = session.get(url, headers=listing_store.search_validators(self.name, url))
+            log_to_csv("Scraping Started", f"URL: {url}")
+            if response.status_code == 304:
+                listing_store.touch_search(self.name, url)
+                cards = listing_store.get_search(self.name, url, max_age=float("inf"))
+                if cards is not None:
+                    return self._from_store(cards)[:limit]
+                response = session.get(url)
+            response.raise_for_status()
+            listings = self.parse_listing_page(response.text)
+            listing_store.save_search(self.name, url, listings, response.headers.get("ETag"),
+                                      response.headers.get("Last-Modified"))
+            return listings[:limit]
+        except Exception as e:
+            log_to_csv(f"Scraping Failed for {self.name} URL", str(e))
+            sys.stderr.write(f"Scraping Failed for {self.name} URL: {e}\n")
+            if degraded is not None:
+                degraded.append(f"{self.name}: search failed")
+            stale = listing_store.get_search(self.name, url, max_age=float("inf"))
+            return self._from_store(stale)[:limit] if stale else None
+
+    def fetch_detail(self, link, session, degraded=None):
+        # ✅ Served from the listing store while fresh (LISTING_DETAIL_TTL); otherwise a
+        # conditional GET, where a 304 just re-validates the stored copy
+        stored = listing_store.get_detail(link)
+        if stored is not None:
+            return stored
+        try:
+            response = session.get(link, headers=listing_store.detail_validators(link))
+            if response.status_code == 304:
+                listing_store.touch_detail(link)
+                stored = listing_store.get_detail(link, max_age=float("inf"))
+                if stored is not None:
+                    return stored
+                response = session.get(link)
+            response.raise_for_status()
+            eligible, job_desc = self.parse_detail_page(response.text)
+            listing_store.save_detail(link, eligible, job_desc, response.headers.get("ETag"),
+                                      response.headers.get("Last-Modified"), source=self.name)
+            return eligible, job_desc
+        except Exception as e:
+            sys.stderr.write(f"Error checking {link}: {e}\n")
+            if degraded is not None:
+                degraded.append(f"{self.name}: detail page failed")
+            # A stale copy beats dropping the listing
+            return listing_store.get_detail(link, max_age=float("inf")) or (False, "")
+
+    def iter_eligible(self, listings, session, limit=None, deadline=None, max_workers=SCRAPE_WORKERS, degraded=None):
+        # ✅ Detail pages are fetched concurrently on the pooled session, but yielded
+        # in page order as soon as each one is ready. Yields (record, job_description)
+        # for up to `limit` eligible listings, stopping early at `deadline` (monotonic).
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            futures = [(job_data, executor.submit(self.fetch_detail, job_data["link"], session, degraded))
+                       for job_data in listings]
+            found = 0
+            for job_data, future in futures:
+                if limit is not None and found >= limit:
+                    break
+                try:
+                    remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                    eligible, job_desc = future.result(timeout=remaining)
+                except FutureTimeoutError:
+                    log_to_csv("Source Deadline Hit", f"{self.name}: {found} eligible listings so far")
+                    sys.stderr.write(f"{self.name}: deadline hit after {found} eligible listings\n")
+                    if degraded is not None:
+                        degraded.append(f"{self.name}: deadline hit")
+                    break
+                if eligible:
+                    found += 1
+                    yield job_data, job_desc
+                else:
+                    log_to_csv("Internship Skipped (Not Eligible)", f"{job_data['title']} - {job_data['link']}")
+        finally:
+            # Stopped early (enough listings, or out of time): drop the fetches that haven't started
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def collect(self, skills, session, listing_limit=None, eligible_limit=None, deadline=None, degraded=None):
+        # One source's share of a fan-out: (listings seen, [(record, job_description), ...])
+        listings = self.fetch_listings(skills, session, listing_limit, degraded) or []
+        return len(listings), list(self.iter_eligible(listings, session, eligible_limit, deadline, degraded=degraded))
+
+
+class InternshalaSource(JobSource):
+    name = "internshala"
+
+    def __init__(self, base_url=None, deadline=None):
+        super().__init__(deadline)
+        self.base_url = base_url or INTERNSHALA_BASE_URL
+
+    def search_url(self, skills):
+        return f"{self.base_url}/internships/{self.search_key(skills)}-internship"
+
+    def parse_listing_page(self, html, limit=None):
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(html, "html.parser")
+        listings = []
+        for div in soup.find_all("div", class_="individual_internship"):
+            if limit is not None and len(listings) >= limit:
+                break
+            try:
+                title_tag = div.find("a", class_="job-title-href")
+                listings.append(self.record(
+                    title=title_tag.text.strip(),
+                    company=div.find("p", class_="company-name").text.strip(),
+                    location=div.find("div", class_="locations").text.strip(),
+                    stipend=div.find("span", class_="stipend").text.strip(),
+                    link=self.base_url + title_tag["href"],
+                ))
+            except Exception as e:
+                log_to_csv("Parse Error for Individual Internship", str(e))
+                sys.stderr.write(f"Parse Error for Individual Internship: {e}\n")
+        return listings
+
+    def parse_detail_page(self, html):
+        # One detail page gives us both the eligibility flag and the job description
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(html, "html.parser")
+        eligible = False
+        button = soup.find('button', class_='btn btn-primary top_apply_now_cta')
+        if button:
+            text = button.get_text(strip=True).lower()
+            eligible = "apply now" in text and "login" not in text and "eligible" not in text
+        jd_div = soup.find("div", class_="internship_details")
+        job_desc = jd_div.get_text(strip=True) if jd_div else ""
+        return eligible, job_desc
+
+    def apply_link(self, link):
+        return link.replace("/internship/detail/", "/application/form/")
+
+
+# ✅ Registered adapters, by the names used in JOB_SOURCES
+SOURCES = {
+    "internshala": InternshalaSource,
+}
+
+
+def configured_sources(names=None):
+    names = names or [name.strip() for name in os.getenv("JOB_SOURCES", "internshala").split(",") if name.strip()]
+    unknown = [name for name in names if name not in SOURCES]
+    if unknown:
+        raise ValueError(f"Unknown job source(s): {', '.join(unknown)}")
+    return [SOURCES[name]() for name in names]
+
+
+def fan_out(sources, skills, session, listing_limit=None, eligible_limit=None, stage_timings=None, degraded=None):
+    # ✅ Searches every source concurrently, each bounded by its own deadline.
+    # Returns (candidates, listings_seen): candidates are (source_index, position, record,
+    # job_description) for eligible listings, deduped by company + title (the earlier
+    # source in `sources` wins). Per-source seconds go into stage_timings as source_<name>;
+    # a source that timed out, failed or came back incomplete is noted in `degraded`.
+    timings = stage_timings if stage_timings is not None else {}
+    start = time.monotonic()
+
+    def run(source):
+        found = source.collect(skills, session, listing_limit, eligible_limit, start + source.deadline, degraded)
+        timings[f"source_{source.name}"] = round(time.monotonic() - start, 3)
+        return found
+
+    executor = ThreadPoolExecutor(max_workers=max(1, len(sources)))
+    try:
+        futures = [(source, executor.submit(run, source)) for source in sources]
+        per_source = []
+        for source, future in futures:
+            try:
+                timeout = max(0.0, start + source.deadline + SOURCE_GRACE - time.monotonic())
+                per_source.append(future.result(timeout=timeout))
+            except FutureTimeoutError:
+                log_to_csv("Source Timed Out", f"{source.name} after {source.deadline}s")
+                sys.stderr.write(f"{source.name}: no results within {source.deadline}s, skipped\n")
+                timings[f"source_{source.name}"] = round(time.monotonic() - start, 3)
+                if degraded is not None:
+                    degraded.append(f"{source.name}: timed out")
+                per_source.append((0, []))
+            except Exception as e:
+                log_to_csv("Source Failed", f"{source.name}: {e}")
+                sys.stderr.write(f"{source.name} failed: {e}\n")
+                if degraded is not None:
+                    degraded.append(f"{source.name}: failed")
+                per_source.append((0, []))
+    finally:
+        # A source past its deadline keeps its thread until its own requests time out
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    candidates = []
+    seen = set()
+    for source_index, (_, found) in enumerate(per_source):
+        for position, (job_data, job_desc) in enumerate(found):
+            key = dedupe_key(job_data)
+            if key in seen:
+                log_to_csv("Duplicate Listing Skipped", f"{job_data['source']}: {job_data['title']} - {job_data['company']}")
+                continue
+            seen.add(key)
+            candidates.append((source_index, position, job_data, job_desc))
+    return candidates, sum(listed for listed, _ in per_source)
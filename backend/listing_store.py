@@ -0,0 +1,213 @@
+# listing_store.py
+# Local index of scraped internship listings, so uploads with the same or
+# overlapping skills don't re-scrape every search and detail page.
+#
+#   listings        one row per listing link: card fields (title, company, ...),
+#                   the eligibility flag and JD from its detail page, fetch
+#                   timestamps and the ETag/Last-Modified for conditional GETs
+#   searches        when each (source, search URL) page was fetched; the URL, not
+#                   just the skills slug, so the same search against another base
+#                   URL (e.g. the benchmark fixture server) is stored separately
+#   search_results  the ordered links each search returned
+#
+# Rows fresher than the search/detail TTLs are served straight from SQLite;
+# stale ones are refreshed with If-None-Match / If-Modified-Since, and a 304
+# only bumps the timestamp. Searches not refreshed for LISTING_STORE_RETENTION
+# (and the oldest ones past LISTING_STORE_MAX_SEARCHES) are swept, along with
+# listings no remaining search returns that weren't seen within the retention.
+# Connections are handled by sqlite_store.py.
+import os
+import time
+
+from metrics import metrics
+from sqlite_store import SQLiteStore
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "listings.sqlite")
+SEARCH_TTL = float(os.getenv("LISTING_SEARCH_TTL", str(6 * 3600)))  # seconds
+DETAIL_TTL = float(os.getenv("LISTING_DETAIL_TTL", str(24 * 3600)))
+DEFAULT_RETENTION = 7 * 24 * 3600
+DEFAULT_MAX_SEARCHES = 5000
+EVICT_EVERY = 100  # writes between eviction sweeps
+
+CARD_FIELDS = ("title", "company", "location", "stipend")
+# Bump when the schema changes; search tables from an older version are dropped
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    link TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    title TEXT, company TEXT, location TEXT, stipend TEXT,
+    eligible INTEGER, job_desc TEXT,
+    card_seen_at REAL, detail_fetched_at REAL,
+    etag TEXT, last_modified TEXT
+);
+CREATE TABLE IF NOT EXISTS searches (
+    source TEXT NOT NULL, url TEXT NOT NULL,
+    fetched_at REAL NOT NULL, etag TEXT, last_modified TEXT,
+    PRIMARY KEY (source, url)
+);
+CREATE TABLE IF NOT EXISTS search_results (
+    source TEXT NOT NULL, url TEXT NOT NULL, position INTEGER NOT NULL, link TEXT NOT NULL,
+    PRIMARY KEY (source, url, position)
+);
+"""
+
+
+def conditional_headers(etag, last_modified):
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+class ListingStore:
+    def __init__(self, path=DEFAULT_PATH, search_ttl=SEARCH_TTL, detail_ttl=DETAIL_TTL,
+                 retention=DEFAULT_RETENTION, max_searches=DEFAULT_MAX_SEARCHES, enabled=True):
+        self.search_ttl = search_ttl
+        self.detail_ttl = detail_ttl
+        self.retention = retention
+        self.max_searches = max_searches
+        self.counters = {"search_hits": 0, "search_misses": 0, "detail_hits": 0, "detail_misses": 0,
+                         "not_modified": 0, "writes": 0}
+        # Searches were keyed by skills slug alone before schema version 2; they are cheap to refetch
+        self.store = SQLiteStore(path, SCHEMA, "Listing store", enabled=enabled, schema_version=SCHEMA_VERSION,
+                                 reset_script="DROP TABLE IF EXISTS searches; DROP TABLE IF EXISTS search_results;")
+
+    # --- search pages ---
+
+    def get_search(self, source, url, max_age=None):
+        # Listing cards for a search, in page order, if it was fetched within max_age
+        # seconds (default: the search TTL); otherwise None
+        counted = max_age is None
+        max_age = self.search_ttl if max_age is None else max_age
+
+        def query(db):
+            search = db.execute("SELECT fetched_at FROM searches WHERE source = ? AND url = ?",
+                                (source, url)).fetchone()
+            if not search or time.time() - search["fetched_at"] > max_age:
+                return None
+            rows = db.execute(
+                "SELECT l.* FROM search_results r JOIN listings l ON l.link = r.link"
+                " WHERE r.source = ? AND r.url = ? ORDER BY r.position", (source, url)).fetchall()
+            return [dict({field: row[field] for field in CARD_FIELDS}, link=row["link"], ats_score=None)
+                    for row in rows]
+
+        listings = self.store.run(query)
+        if counted:
+            self.counters["search_hits" if listings is not None else "search_misses"] += 1
+            metrics.inc("cache_requests_total", cache="listing_search", result="hit" if listings is not None else "miss")
+        return listings
+
+    def search_validators(self, source, url):
+        row = self.store.run(lambda db: db.execute(
+            "SELECT etag, last_modified FROM searches WHERE source = ? AND url = ?", (source, url)).fetchone())
+        return conditional_headers(row["etag"], row["last_modified"]) if row else {}
+
+    def touch_search(self, source, url):
+        self.counters["not_modified"] += 1
+        metrics.inc("listing_revalidated_total", kind="search")
+
+        def update(db):
+            db.execute("UPDATE searches SET fetched_at = ? WHERE source = ? AND url = ?", (time.time(), source, url))
+            db.commit()
+        self.store.run(update)
+
+    def save_search(self, source, url, listings, etag=None, last_modified=None):
+        now = time.time()
+
+        def write(db):
+            for job in listings:
+                db.execute(
+                    "INSERT INTO listings (link, source, title, company, location, stipend, card_seen_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)"
+                    " ON CONFLICT(link) DO UPDATE SET title = excluded.title, company = excluded.company,"
+                    " location = excluded.location, stipend = excluded.stipend, card_seen_at = excluded.card_seen_at",
+                    (job["link"], source, job["title"], job["company"], job["location"], job["stipend"], now))
+            db.execute("DELETE FROM search_results WHERE source = ? AND url = ?", (source, url))
+            db.executemany(
+                "INSERT INTO search_results (source, url, position, link) VALUES (?, ?, ?, ?)",
+                [(source, url, position, job["link"]) for position, job in enumerate(listings)])
+            db.execute("INSERT OR REPLACE INTO searches (source, url, fetched_at, etag, last_modified)"
+                       " VALUES (?, ?, ?, ?, ?)", (source, url, now, etag, last_modified))
+            self._written(db, now)
+            db.commit()
+        self.store.run(write)
+
+    # --- detail pages ---
+
+    def get_detail(self, link, max_age=None):
+        # (eligible, job_desc) if the detail page was fetched within max_age seconds
+        # (default: the detail TTL); otherwise None
+        counted = max_age is None
+        max_age = self.detail_ttl if max_age is None else max_age
+        row = self.store.run(lambda db: db.execute(
+            "SELECT eligible, job_desc, detail_fetched_at FROM listings WHERE link = ?", (link,)).fetchone())
+        fresh = bool(row and row["detail_fetched_at"] and time.time() - row["detail_fetched_at"] <= max_age)
+        if counted:
+            self.counters["detail_hits" if fresh else "detail_misses"] += 1
+            metrics.inc("cache_requests_total", cache="listing_detail", result="hit" if fresh else "miss")
+        return (bool(row["eligible"]), row["job_desc"] or "") if fresh else None
+
+    def detail_validators(self, link):
+        row = self.store.run(lambda db: db.execute(
+            "SELECT etag, last_modified FROM listings WHERE link = ? AND detail_fetched_at IS NOT NULL",
+            (link,)).fetchone())
+        return conditional_headers(row["etag"], row["last_modified"]) if row else {}
+
+    def touch_detail(self, link):
+        self.counters["not_modified"] += 1
+        metrics.inc("listing_revalidated_total", kind="detail")
+
+        def update(db):
+            db.execute("UPDATE listings SET detail_fetched_at = ? WHERE link = ?", (time.time(), link))
+            db.commit()
+        self.store.run(update)
+
+    def save_detail(self, link, eligible, job_desc, etag=None, last_modified=None, source="internshala"):
+        now = time.time()
+
+        def write(db):
+            db.execute(
+                "INSERT INTO listings (link, source, eligible, job_desc, detail_fetched_at, etag, last_modified)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT(link) DO UPDATE SET eligible = excluded.eligible, job_desc = excluded.job_desc,"
+                " detail_fetched_at = excluded.detail_fetched_at, etag = excluded.etag,"
+                " last_modified = excluded.last_modified",
+                (link, source, int(eligible), job_desc, now, etag, last_modified))
+            self._written(db, now)
+            db.commit()
+        self.store.run(write)
+
+    # --- eviction ---
+
+    def _written(self, db, now):
+        self.counters["writes"] += 1
+        if self.counters["writes"] % EVICT_EVERY == 0:
+            self._evict(db, now)
+
+    def _evict(self, db, now):
+        cutoff = now - self.retention
+        db.execute("DELETE FROM searches WHERE fetched_at < ?", (cutoff,))
+        (rows,) = db.execute("SELECT COUNT(*) FROM searches").fetchone()
+        if rows > self.max_searches:
+            db.execute("DELETE FROM searches WHERE rowid IN"
+                       " (SELECT rowid FROM searches ORDER BY fetched_at ASC LIMIT ?)", (rows - self.max_searches,))
+        db.execute("DELETE FROM search_results WHERE NOT EXISTS (SELECT 1 FROM searches s"
+                   " WHERE s.source = search_results.source AND s.url = search_results.url)")
+        db.execute("DELETE FROM listings WHERE MAX(COALESCE(card_seen_at, 0), COALESCE(detail_fetched_at, 0)) < ?"
+                   " AND link NOT IN (SELECT link FROM search_results)", (cutoff,))
+
+    def stats(self):
+        return dict(self.counters)
+
+
+# ✅ Shared store; LISTING_STORE_DISABLED=1 always scrapes live
+listing_store = ListingStore(
+    path=os.getenv("LISTING_STORE_PATH", DEFAULT_PATH),
+    retention=float(os.getenv("LISTING_STORE_RETENTION", DEFAULT_RETENTION)),
+    max_searches=int(os.getenv("LISTING_STORE_MAX_SEARCHES", DEFAULT_MAX_SEARCHES)),
+    enabled=os.getenv("LISTING_STORE_DISABLED", "") not in ("1", "true"),
+)
@@ -0,0 +1,303 @@
+# llm_client.py
+# The one place Gemini is called from (skill_extractor.py, ats_matcher.py, resume.py).
+#
+# - Token buckets for requests/minute and tokens/minute. Their state lives in
+#   cache/llm_budget.sqlite (LLM_BUDGET_PATH), so every process draws from one
+#   budget: the --serve worker pool, batch_rank.py and the resume.py /
+#   ats_matcher.py processes the server starts per request.
+# - Priorities: callers queue in-process by priority. A caller that has to wait
+#   is registered in the shared file, and lower-priority (bulk) callers in any
+#   process hold back while a higher-priority (interactive) one is waiting.
+#   Optionally, bulk calls may also leave a slice of the budget untouched
+#   (LLM_INTERACTIVE_RESERVE) so interactive ones don't wait for a refill.
+# - Jittered exponential backoff on quota/availability errors, honouring the
+#   server's retry_delay when it sends one.
+# - A circuit breaker, also shared through the file, that fails fast
+#   (ResourceExhausted) after repeated failures instead of queueing more doomed calls.
+# - metrics() for queue depth, wait time, retries and tokens sent.
+# google.generativeai and google.api_core (~1s of imports) are only loaded on
+# the first real call, so cache hits and error paths never pay for them.
+import heapq
+import itertools
+import os
+import random
+import re
+import sys
+import threading
+import time
+
+from metrics import metrics
+from sqlite_store import SQLiteStore
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 1
+PRIORITY_NAMES = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_BULK: "bulk"}
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "llm_budget.sqlite")
+# A waiting caller re-polls the budget at least this often (seconds); a waiter row
+# not refreshed for WAITER_TTL belongs to a caller that is gone (e.g. killed)
+MAX_POLL = 1.0
+WAITER_TTL = 5.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS budget (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    requests REAL NOT NULL, tokens REAL NOT NULL, refilled_at REAL NOT NULL,
+    failures INTEGER NOT NULL DEFAULT 0, open_until REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS waiters (
+    ticket TEXT PRIMARY KEY, priority INTEGER NOT NULL, seen_at REAL NOT NULL
+);
+"""
+
+
+def estimate_tokens(text):
+    # Rough Gemini tokenisation: ~4 characters per token
+    return max(1, len(text) // 4)
+
+
+class LLMClient:
+    def __init__(self, path=DEFAULT_PATH, rpm=15, tpm=1000000, interactive_reserve=0.0, max_attempts=3,
+                 base_delay=2.0, max_delay=60.0, breaker_threshold=5, breaker_cooldown=60.0,
+                 output_tokens_estimate=64):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.interactive_reserve = interactive_reserve
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self.output_tokens_estimate = output_tokens_estimate
+        self.api_key = None
+        self._genai = None
+
+        self.store = SQLiteStore(path, SCHEMA, "LLM budget")
+
+        self._cond = threading.Condition()
+        self._waiters = []
+        self._seq = itertools.count()
+        self._stats_lock = threading.Lock()
+        self._stats = {"calls": 0, "retries": 0, "failures": 0, "circuit_opens": 0,
+                       "rejected_open_circuit": 0, "tokens_sent": 0, "max_queue_depth": 0}
+        self._waits = {name: {"count": 0, "total_s": 0.0, "max_s": 0.0} for name in PRIORITY_NAMES.values()}
+
+    def configure(self, api_key):
+        # Applied to google.generativeai on the first call
+        self.api_key = api_key
+        self._genai = None
+
+    def _load_genai(self):
+        if self._genai is None:
+            import google.generativeai as genai
+            if self.api_key:
+                genai.configure(api_key=self.api_key)
+            self._genai = genai
+        return self._genai
+
+    # --- token buckets (shared across processes) ---
+
+    def _transaction(self, fn):
+        # fn(db, now) inside one write transaction on the shared file. None if the file
+        # is unusable: the failure is logged and callers carry on unthrottled
+        def run(db):
+            db.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            db.execute("INSERT OR IGNORE INTO budget (id, requests, tokens, refilled_at) VALUES (1, ?, ?, ?)",
+                       (self.rpm, self.tpm, now))
+            result = fn(db, now)
+            db.commit()
+            return result
+        return self.store.run(run)
+
+    def _try_take(self, tokens, priority, ticket):
+        # Takes one request and `tokens` tokens if available; otherwise registers `ticket`
+        # as waiting and returns seconds to wait
+        tokens = min(tokens, self.tpm)
+        reserve = 0.0 if priority == PRIORITY_INTERACTIVE else self.interactive_reserve
+        need_requests = min(self.rpm, 1 + reserve * self.rpm)
+        need_tokens = min(self.tpm, tokens + reserve * self.tpm)
+
+        def take(db, now):
+            row = db.execute("SELECT requests, tokens, refilled_at FROM budget WHERE id = 1").fetchone()
+            elapsed = max(0.0, now - row["refilled_at"])
+            requests = min(self.rpm, row["requests"] + elapsed * self.rpm / 60)
+            available = min(self.tpm, row["tokens"] + elapsed * self.tpm / 60)
+            db.execute("DELETE FROM waiters WHERE seen_at < ?", (now - WAITER_TTL,))
+            # Someone more urgent is waiting, possibly in another process: let them go first
+            outranked = db.execute("SELECT 1 FROM waiters WHERE priority < ? LIMIT 1", (priority,)).fetchone()
+            if not outranked and requests >= need_requests and available >= need_tokens:
+                requests -= 1
+                available -= tokens
+                wait = 0.0
+                db.execute("DELETE FROM waiters WHERE ticket = ?", (ticket,))
+            else:
+                wait_requests = (need_requests - requests) * 60 / self.rpm
+                wait_tokens = (need_tokens - available) * 60 / self.tpm
+                wait = min(MAX_POLL, max(wait_requests, wait_tokens, 0.01))
+                db.execute("INSERT OR REPLACE INTO waiters (ticket, priority, seen_at) VALUES (?, ?, ?)",
+                           (ticket, priority, now))
+            db.execute("UPDATE budget SET requests = ?, tokens = ?, refilled_at = ? WHERE id = 1",
+                       (requests, available, now))
+            return wait
+
+        return self._transaction(take) or 0.0
+
+    def _leave(self, ticket):
+        def leave(db, now):
+            db.execute("DELETE FROM waiters WHERE ticket = ?", (ticket,))
+        self._transaction(leave)
+
+    def _acquire(self, tokens, priority):
+        # Highest priority (lowest number), then FIFO, gets the next slot
+        ticket = (priority, next(self._seq))
+        shared_ticket = f"{os.getpid()}:{ticket[1]}"
+        start = time.time()
+        registered = taken = False
+        with self._cond:
+            heapq.heappush(self._waiters, ticket)
+            with self._stats_lock:
+                self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], len(self._waiters))
+            try:
+                while True:
+                    wait = 0.5
+                    if self._waiters[0] == ticket:
+                        wait = self._try_take(tokens, priority, shared_ticket)
+                        if not wait:
+                            taken = True
+                            break
+                        registered = True
+                    self._cond.wait(timeout=wait)
+            finally:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+        if registered and not taken:
+            self._leave(shared_ticket)
+
+        waited = time.time() - start
+        with self._stats_lock:
+            waits = self._waits[PRIORITY_NAMES.get(priority, "bulk")]
+            waits["count"] += 1
+            waits["total_s"] += waited
+            waits["max_s"] = max(waits["max_s"], waited)
+        metrics.observe("llm_queue_wait_seconds", waited, priority=PRIORITY_NAMES.get(priority, "bulk"))
+
+    # --- circuit breaker (shared across processes) ---
+
+    def _state(self):
+        return self.store.run(lambda db: db.execute(
+            "SELECT requests, open_until FROM budget WHERE id = 1").fetchone())
+
+    def _check_circuit(self):
+        state = self._state()
+        open_for = (state["open_until"] if state else 0.0) - time.time()
+        if open_for > 0:
+            from google.api_core.exceptions import ResourceExhausted
+            with self._stats_lock:
+                self._stats["rejected_open_circuit"] += 1
+            metrics.inc("llm_rejected_total", reason="circuit_open")
+            raise ResourceExhausted(f"Gemini circuit open for another {open_for:.0f}s after repeated failures")
+
+    def _record_success(self):
+        def reset(db, now):
+            db.execute("UPDATE budget SET failures = 0 WHERE id = 1 AND failures != 0")
+        self._transaction(reset)
+
+    def _record_failure(self):
+        def fail(db, now):
+            (failures,) = db.execute("SELECT failures FROM budget WHERE id = 1").fetchone()
+            failures += 1
+            if failures < self.breaker_threshold:
+                db.execute("UPDATE budget SET failures = ? WHERE id = 1", (failures,))
+                return False
+            # Half-open after the cooldown: one more failure re-opens immediately
+            db.execute("UPDATE budget SET failures = ?, open_until = ? WHERE id = 1",
+                       (self.breaker_threshold - 1, now + self.breaker_cooldown))
+            return True
+
+        if not self._transaction(fail):
+            return
+        with self._stats_lock:
+            self._stats["circuit_opens"] += 1
+        sys.stderr.write(f"❌ Gemini circuit opened for {self.breaker_cooldown:.0f}s after repeated failures\n")
+
+    def _backoff(self, attempt, error):
+        match = re.search(r"retry_delay {\s+seconds: (\d+)", str(error))
+        if match:
+            # The server told us how long to wait; add a little jitter so workers don't stampede
+            return int(match.group(1)) + random.uniform(0, 1)
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    # --- public API ---
+
+    def generate(self, prompt, model_name, priority=PRIORITY_BULK):
+        from google.api_core.exceptions import (
+            Aborted,
+            DeadlineExceeded,
+            InternalServerError,
+            ResourceExhausted,
+            ServiceUnavailable,
+        )
+        retryable_errors = (ResourceExhausted, Aborted, ServiceUnavailable, DeadlineExceeded, InternalServerError)
+        genai = self._load_genai()
+        tokens = estimate_tokens(prompt) + self.output_tokens_estimate
+        for attempt in range(self.max_attempts):
+            self._check_circuit()
+            self._acquire(tokens, priority)
+            start = time.perf_counter()
+            try:
+                model = genai.GenerativeModel(model_name)
+                response = model.generate_content(prompt)
+                text = response.text
+            except retryable_errors as e:
+                metrics.observe("llm_request_seconds", time.perf_counter() - start,
+                                model=model_name, outcome=type(e).__name__)
+                self._record_failure()
+                with self._stats_lock:
+                    self._stats["failures"] += 1
+                sys.stderr.write(f"❌ Gemini call failed (Attempt {attempt+1}/{self.max_attempts}): {e}\n")
+                if attempt == self.max_attempts - 1:
+                    raise
+                delay = self._backoff(attempt, e)
+                sys.stderr.write(f"Retrying in {delay:.1f} seconds...\n")
+                with self._stats_lock:
+                    self._stats["retries"] += 1
+                metrics.inc("llm_retries_total", model=model_name)
+                time.sleep(delay)
+                continue
+
+            metrics.observe("llm_request_seconds", time.perf_counter() - start, model=model_name, outcome="ok")
+            metrics.inc("llm_tokens_sent_total", estimate_tokens(prompt), model=model_name)
+            self._record_success()
+            with self._stats_lock:
+                self._stats["calls"] += 1
+                self._stats["tokens_sent"] += estimate_tokens(prompt)
+            return text
+
+    def metrics(self):
+        state = self._state()
+        circuit_open = bool(state and state["open_until"] > time.time())
+        requests_available = state["requests"] if state else float(self.rpm)
+        with self._cond:
+            queue_depth = len(self._waiters)
+        with self._stats_lock:
+            waits = {
+                name: dict(w, avg_s=round(w["total_s"] / w["count"], 3) if w["count"] else 0.0)
+                for name, w in self._waits.items()
+            }
+            return dict(self._stats, queue_depth=queue_depth, circuit_open=circuit_open,
+                        requests_available=round(requests_available, 2), waits=waits)
+
+
+# ✅ Shared client; limits come from the environment (defaults match the Gemini free tier)
+llm_client = LLMClient(
+    path=os.getenv("LLM_BUDGET_PATH", DEFAULT_PATH),
+    rpm=float(os.getenv("LLM_RPM", "15")),
+    tpm=float(os.getenv("LLM_TPM", "1000000")),
+    interactive_reserve=float(os.getenv("LLM_INTERACTIVE_RESERVE", "0")),
+    max_attempts=int(os.getenv("LLM_MAX_ATTEMPTS", "3")),
+    breaker_threshold=int(os.getenv("LLM_BREAKER_THRESHOLD", "5")),
+    breaker_cooldown=float(os.getenv("LLM_BREAKER_COOLDOWN", "60")),
+)
@@ -0,0 +1,197 @@
+# local_scorer.py
+# Deterministic, offline ATS scoring: a resume against one or many JDs in
+# milliseconds, with no Gemini call.
+#
+# score = skill_weight * weighted skill overlap + (1 - skill_weight) * TF-IDF cosine
+#
+# - Skills come from the same skill taxonomy as extract_skills. Each
+#   JD skill is weighted by its IDF across the JDs being scored, so rare,
+#   specific skills count more than ones every listing mentions.
+# - TF-IDF is computed over a dense numpy term matrix (resume + JDs). Cosine
+#   scores for resume/JD pairs rarely exceed ~0.4, so similarity is scaled by
+#   `similarity_ceiling` before blending.
+# - missing_keywords lists JD skills absent from the resume, then the JD's
+#   highest-weighted repeated terms the resume never mentions.
+import math
+import re
+from collections import Counter
+
+import numpy as np
+
+from skill_taxonomy import skill_taxonomy
+from stop_words_en import STOP_WORDS
+
+# A leading dot is kept only at the start of a word (".net", not "...python")
+TOKEN_RE = re.compile(r"(?:(?<!\S)\.)?[a-z0-9][a-z0-9+#.\-]*")
+
+
+class LocalScorer:
+    def __init__(self, skill_matcher, stop_words=frozenset(), skill_weight=0.6,
+                 similarity_ceiling=0.4, max_missing=10):
+        self.matcher = skill_matcher
+        self.stop_words = stop_words
+        self.skill_weight = skill_weight
+        self.similarity_ceiling = similarity_ceiling
+        self.max_missing = max_missing
+
+    def tokenize(self, text):
+        tokens = (token.rstrip(".-") for token in TOKEN_RE.findall(text.lower()))
+        return [token for token in tokens if token and token not in self.stop_words]
+
+    def skills_in(self, text):
+        return self.matcher.find(" ".join(self.tokenize(text)))
+
+    def score_many(self, resume_text, jd_texts, resume_skills=None):
+        # One result dict per JD, in order:
+        # {"score", "skill_overlap", "similarity", "matched_skills", "missing_keywords"}
+        if not jd_texts:
+            return []
+        resume_tokens = self.tokenize(resume_text)
+        jd_tokens = [self.tokenize(text) for text in jd_texts]
+        if resume_skills is None:
+            resume_skills = self.matcher.find(" ".join(resume_tokens))
+        resume_skills = set(resume_skills)
+        jd_skills = [self.matcher.find(" ".join(tokens)) for tokens in jd_tokens]
+
+        # Term matrix: row 0 is the resume, rows 1.. are the JDs
+        docs = [[t for t in tokens if not t.isdigit()] for tokens in [resume_tokens] + jd_tokens]
+        vocab = {}
+        for doc in docs:
+            for term in doc:
+                vocab.setdefault(term, len(vocab))
+        terms = list(vocab)
+        counts = np.zeros((len(docs), max(1, len(vocab))))
+        for row, doc in enumerate(docs):
+            for term, count in Counter(doc).items():
+                counts[row, vocab[term]] = count
+
+        df = (counts > 0).sum(axis=0)
+        idf = np.log((1 + len(docs)) / (1 + df)) + 1
+        weights = np.log1p(counts) * idf
+        norms = np.linalg.norm(weights, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        unit = weights / norms
+        similarities = unit[1:] @ unit[0]
+
+        skill_df = Counter(skill for skills in jd_skills for skill in skills)
+        results = []
+        for row, skills in enumerate(jd_skills, 1):
+            similarity = float(similarities[row - 1])
+            scaled_similarity = min(1.0, similarity / self.similarity_ceiling)
+            skill_weights = {s: math.log((1 + len(jd_texts)) / (1 + skill_df[s])) + 1 for s in skills}
+            matched = skills & resume_skills
+            if skill_weights:
+                overlap = sum(skill_weights[s] for s in matched) / sum(skill_weights.values())
+                blended = self.skill_weight * overlap + (1 - self.skill_weight) * scaled_similarity
+            else:
+                overlap = None
+                blended = scaled_similarity
+
+            missing = sorted(skills - resume_skills, key=lambda s: (-skill_weights[s], s))
+            for index in np.argsort(-weights[row]):
+                if len(missing) >= self.max_missing or weights[row, index] <= 0:
+                    break
+                term = terms[index]
+                # Non-skill terms only count as keywords when the JD repeats them
+                if counts[0, index] == 0 and counts[row, index] >= 2 and len(term) > 2 and term not in missing:
+                    missing.append(term)
+
+            results.append({
+                "score": int(round(100 * blended)),
+                "skill_overlap": round(overlap, 3) if overlap is not None else None,
+                "similarity": round(similarity, 3),
+                "matched_skills": sorted(matched),
+                "missing_keywords": missing[:self.max_missing],
+            })
+        return results
+
+    def score_matrix(self, resume_texts, jd_texts, resume_skills=None):
+        # Batch variant of score_many for many resumes against one shared set of JDs:
+        # an int array of scores, shape (len(resume_texts), len(jd_texts)). Same blend,
+        # but term IDF is fitted over all resumes + JDs and skill IDF over all JDs, and
+        # no missing_keywords are computed.
+        if not resume_texts or not jd_texts:
+            return np.zeros((len(resume_texts), len(jd_texts)), dtype=int)
+        resume_tokens = [self.tokenize(text) for text in resume_texts]
+        jd_tokens = [self.tokenize(text) for text in jd_texts]
+        if resume_skills is None:
+            resume_skills = [self.matcher.find(" ".join(tokens)) for tokens in resume_tokens]
+        jd_skills = [self.matcher.find(" ".join(tokens)) for tokens in jd_tokens]
+
+        resume_counts = [Counter(t for t in tokens if not t.isdigit()) for tokens in resume_tokens]
+        jd_counts = [Counter(t for t in tokens if not t.isdigit()) for tokens in jd_tokens]
+        df = Counter(term for counts in resume_counts + jd_counts for term in counts)
+        n_docs = len(resume_counts) + len(jd_counts)
+
+        def idf(term):
+            return math.log((1 + n_docs) / (1 + df[term])) + 1
+
+        # Only terms that occur in some JD can contribute to a dot product, so the
+        # matrices are limited to the JD vocabulary; resume norms still use every term
+        vocab = {}
+        for counts in jd_counts:
+            for term in counts:
+                vocab.setdefault(term, len(vocab))
+        idf_vector = np.array([idf(term) for term in vocab], dtype=np.float32)
+
+        def weight_matrix(all_counts):
+            matrix = np.zeros((len(all_counts), max(1, len(vocab))), dtype=np.float32)
+            for row, counts in enumerate(all_counts):
+                for term, count in counts.items():
+                    column = vocab.get(term)
+                    if column is not None:
+                        matrix[row, column] = count
+            matrix[:, :len(vocab)] = np.log1p(matrix[:, :len(vocab)]) * idf_vector
+            return matrix
+
+        resume_weights = weight_matrix(resume_counts)
+        jd_weights = weight_matrix(jd_counts)
+        resume_norms = np.array([math.sqrt(sum((math.log1p(count) * idf(term)) ** 2 for term, count in counts.items()))
+                                 for counts in resume_counts], dtype=np.float32)
+        jd_norms = np.linalg.norm(jd_weights, axis=1)
+        resume_norms[resume_norms == 0] = 1
+        jd_norms[jd_norms == 0] = 1
+        similarities = (resume_weights @ jd_weights.T) / np.outer(resume_norms, jd_norms)
+        scaled_similarities = np.minimum(1.0, similarities / self.similarity_ceiling)
+
+        # Skill overlap: resume skill incidence @ IDF-weighted JD skill incidence
+        skill_index = {}
+        for skills in jd_skills:
+            for skill in skills:
+                skill_index.setdefault(skill, len(skill_index))
+        jd_skill_matrix = np.zeros((len(jd_texts), max(1, len(skill_index))), dtype=np.float32)
+        for row, skills in enumerate(jd_skills):
+            for skill in skills:
+                jd_skill_matrix[row, skill_index[skill]] = 1
+        skill_idf = np.log((1 + len(jd_texts)) / (1 + jd_skill_matrix.sum(axis=0))) + 1
+        jd_skill_weights = jd_skill_matrix * skill_idf
+        resume_skill_matrix = np.zeros((len(resume_texts), jd_skill_matrix.shape[1]), dtype=np.float32)
+        for row, skills in enumerate(resume_skills):
+            for skill in skills:
+                column = skill_index.get(skill)
+                if column is not None:
+                    resume_skill_matrix[row, column] = 1
+        totals = jd_skill_weights.sum(axis=1)
+        overlap = (resume_skill_matrix @ jd_skill_weights.T) / np.where(totals > 0, totals, 1)
+
+        blended = np.where(totals > 0,
+                           self.skill_weight * overlap + (1 - self.skill_weight) * scaled_similarities,
+                           scaled_similarities)
+        return np.rint(100 * blended).astype(int)
+
+    def score(self, resume_text, jd_text, resume_skills=None):
+        return self.score_many(resume_text, [jd_text], resume_skills)[0]
+
+    def relevance(self, resume_skills, title, jd_text):
+        # Cheap pre-ranking signal: share of the resume's skills the listing mentions,
+        # with a hit in the title counting double
+        resume_skills = set(resume_skills)
+        if not resume_skills:
+            return 0.0
+        title_hits = self.skills_in(title) & resume_skills
+        jd_hits = self.skills_in(jd_text) & resume_skills
+        return (2 * len(title_hits) + len(jd_hits)) / (3 * len(resume_skills))
+
+
+# ✅ Shared scorer over the skill taxonomy (aliases resolve to canonical names)
+local_scorer = LocalScorer(skill_taxonomy, STOP_WORDS)
@@ -0,0 +1,138 @@
+# metrics.py
+# Lightweight timers and counters for the Python workers (skill_extractor.py,
+# ats_matcher.py, resume.py and the modules they share).
+#
+#   with metrics.timer("pdf_parse_seconds"):
+#       ...
+#   metrics.inc("cache_requests_total", cache="response", result="hit")
+#
+# Off unless METRICS_ENABLED=1: inc/observe return immediately and timer()
+# hands back one shared no-op context manager, so instrumented code pays about
+# one attribute lookup per call. When on, snapshot() is a JSON-friendly dict
+# (skill_extractor attaches it to each result under "metrics") and
+# prometheus_text() renders the Prometheus text exposition format; set
+# METRICS_TEXTFILE to have write_textfile() drop it where a node_exporter
+# textfile collector can pick it up.
+import os
+import threading
+import time
+
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    def __init__(self, registry, name, labels):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.observe(self.name, time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+def _key(name, labels):
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_key(key):
+    name, labels = key
+    if not labels:
+        return name
+    return name + "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+
+class Metrics:
+    def __init__(self, enabled=False, prefix="resumate_"):
+        self.enabled = enabled
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._timers = {}  # key -> [count, total seconds, max seconds]
+
+    def inc(self, name, value=1, **labels):
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, seconds, **labels):
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            stats = self._timers.get(key)
+            if stats is None:
+                self._timers[key] = [1, seconds, seconds]
+            else:
+                stats[0] += 1
+                stats[1] += seconds
+                stats[2] = max(stats[2], seconds)
+
+    def timer(self, name, **labels):
+        if not self.enabled:
+            return NULL_TIMER
+        return _Timer(self, name, labels)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._timers.clear()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "counters": {_format_key(key): value for key, value in sorted(self._counters.items())},
+                "timers": {
+                    _format_key(key): {"count": count, "sum_s": round(total, 6), "max_s": round(longest, 6)}
+                    for key, (count, total, longest) in sorted(self._timers.items())
+                },
+            }
+
+    def prometheus_text(self):
+        # Counters as counters, timers as summaries (_count/_sum)
+        lines = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            timers = sorted(self._timers.items())
+        typed = set()
+        for (name, labels), value in counters:
+            if name not in typed:
+                lines.append(f"# TYPE {self.prefix}{name} counter")
+                typed.add(name)
+            lines.append(f"{_format_key((self.prefix + name, labels))} {value}")
+        for (name, labels), (count, total, _) in timers:
+            if name not in typed:
+                lines.append(f"# TYPE {self.prefix}{name} summary")
+                typed.add(name)
+            lines.append(f"{_format_key((self.prefix + name + '_count', labels))} {count}")
+            lines.append(f"{_format_key((self.prefix + name + '_sum', labels))} {total:.6f}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path=None):
+        path = path or os.getenv("METRICS_TEXTFILE")
+        if not self.enabled or not path:
+            return
+        # Write-then-rename so a scraper never reads a half-written file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp_path, path)
+
+
+# ✅ Shared registry; each process (e.g. every --serve worker) keeps its own
+metrics = Metrics(enabled=os.getenv("METRICS_ENABLED", "") in ("1", "true"))
@@ -0,0 +1,218 @@
+# pdf_text.py
+# Bounded PDF text extraction for resume uploads.
+#
+# Pages are read lazily and extraction stops as soon as max_pages or max_chars
+# is reached, so a 300-page portfolio costs about as much as a 2-page resume
+# (only the first few thousand characters are ever scored anyway).
+# Guards against pathological uploads: a file-size cap, password-protected
+# files, and a hard wall-clock budget.
+#
+# MuPDF can hang inside fitz.open or get_text on a crafted file, where no
+# Python-level check runs, so the pages are extracted in a forked child that
+# streams them back over a pipe. When the budget runs out the child is killed
+# and whatever text already arrived is returned. Plain os.fork is used rather
+# than multiprocessing because the skill_extractor --serve and batch_rank
+# workers are daemonic and may not start multiprocessing children. Large
+# documents are split across several such children.
+import os
+import select
+import signal
+import struct
+import sys
+import time
+from collections import deque
+
+import fitz  # PyMuPDF
+
+MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "30"))
+MAX_CHARS = int(os.getenv("PDF_MAX_CHARS", "20000"))
+MAX_BYTES = int(os.getenv("PDF_MAX_BYTES", str(20 * 1024 * 1024)))
+TIME_BUDGET = float(os.getenv("PDF_TIME_BUDGET", "10"))  # seconds
+PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "24"))
+PARALLEL_CHUNK_PAGES = 8
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", "0")) or os.cpu_count() or 1
+
+# Pipe frames: kind (b"n" page count, b"p" page text, b"e" error) + payload length
+_FRAME = struct.Struct("!cI")
+
+
+def _check_size(pdf_path):
+    size = os.path.getsize(pdf_path)
+    if size > MAX_BYTES:
+        raise ValueError(f"PDF is {size} bytes, over the {MAX_BYTES} byte limit")
+
+
+def open_pdf(pdf_path):
+    _check_size(pdf_path)
+    doc = fitz.open(pdf_path)
+    if doc.needs_pass:
+        doc.close()
+        raise ValueError("PDF is password protected")
+    return doc
+
+
+def _page_ranges(page_count, workers):
+    # One range for a short document, otherwise PARALLEL_CHUNK_PAGES-page chunks
+    if workers <= 1 or page_count < PARALLEL_MIN_PAGES:
+        return [(0, page_count)]
+    return [(start, min(start + PARALLEL_CHUNK_PAGES, page_count))
+            for start in range(0, page_count, PARALLEL_CHUNK_PAGES)]
+
+
+def _send(out, kind, payload=b""):
+    out.write(_FRAME.pack(kind, len(payload)) + payload)
+    out.flush()
+
+
+def _write_pages(out, pdf_path, start, stop, max_pages, max_chars, workers):
+    # Runs in the child. stop=None marks the first child: it reports the page count
+    # and extracts the first range (all of it unless the document gets split)
+    try:
+        doc = open_pdf(pdf_path)
+    except Exception as e:
+        _send(out, b"e", str(e).encode("utf-8"))
+        return
+    try:
+        if stop is None:
+            page_count = doc.page_count if max_pages is None else min(doc.page_count, max_pages)
+            _send(out, b"n", str(page_count).encode("ascii"))
+            start, stop = _page_ranges(page_count, workers)[0]
+        total = 0
+        for number in range(start, stop):
+            text = doc.load_page(number).get_text()
+            _send(out, b"p", text.encode("utf-8", "surrogatepass"))
+            total += len(text)
+            if max_chars and total >= max_chars:
+                break
+    finally:
+        doc.close()
+
+
+class _PageReader:
+    # One forked child extracting pages of pdf_path, read back through a pipe
+    def __init__(self, pdf_path, start, stop, max_pages, max_chars, workers):
+        read_fd, write_fd = os.pipe()
+        self.pid = os.fork()
+        if self.pid == 0:
+            status = 0
+            try:
+                os.close(read_fd)
+                with os.fdopen(write_fd, "wb") as out:
+                    _write_pages(out, pdf_path, start, stop, max_pages, max_chars, workers)
+            except BaseException:
+                status = 1
+            finally:
+                os._exit(status)
+        os.close(write_fd)
+        self.fd = read_fd
+        self.buffer = b""
+
+    def frames(self, deadline):
+        # Yields (kind, payload) until the child closes the pipe; TimeoutError past the deadline
+        while True:
+            while len(self.buffer) >= _FRAME.size:
+                kind, size = _FRAME.unpack_from(self.buffer)
+                end = _FRAME.size + size
+                if len(self.buffer) < end:
+                    break
+                payload, self.buffer = self.buffer[_FRAME.size:end], self.buffer[end:]
+                yield kind, payload
+            timeout = None if deadline is None else deadline - time.monotonic()
+            if timeout is not None and (timeout <= 0 or not select.select([self.fd], [], [], timeout)[0]):
+                raise TimeoutError
+            chunk = os.read(self.fd, 65536)
+            if not chunk:
+                return
+            self.buffer += chunk
+
+    def close(self):
+        # Kills the child if it's still running (e.g. stuck in MuPDF) and reaps it
+        try:
+            os.kill(self.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        try:
+            os.waitpid(self.pid, 0)
+        except ChildProcessError:
+            pass
+        os.close(self.fd)
+
+
+def _iter_pages_inline(pdf_path, max_pages, time_budget):
+    # No os.fork (Windows): extract in-process, checking the budget between pages only
+    deadline = time.monotonic() + time_budget if time_budget else None
+    doc = open_pdf(pdf_path)
+    try:
+        stop = doc.page_count if max_pages is None else min(doc.page_count, max_pages)
+        for number in range(stop):
+            if deadline and time.monotonic() > deadline:
+                sys.stderr.write(f"PDF extraction budget ({time_budget}s) hit after {number} pages of {pdf_path}\n")
+                return
+            yield doc.load_page(number).get_text()
+    finally:
+        doc.close()
+
+
+def _iter_pages(pdf_path, max_pages, max_chars, time_budget, workers):
+    if not hasattr(os, "fork"):
+        yield from _iter_pages_inline(pdf_path, max_pages, time_budget)
+        return
+    _check_size(pdf_path)
+    deadline = time.monotonic() + time_budget if time_budget else None
+    readers = deque([_PageReader(pdf_path, 0, None, max_pages, max_chars, workers)])
+    remaining = deque()
+    pages = 0
+
+    def top_up():
+        # Start the other chunks of a split document, at most `workers` children at a time
+        while remaining and len(readers) < workers:
+            start, stop = remaining.popleft()
+            readers.append(_PageReader(pdf_path, start, stop, max_pages, max_chars, workers))
+
+    try:
+        first = True
+        while readers:
+            for kind, payload in readers[0].frames(deadline):
+                if kind == b"e":
+                    message = payload.decode("utf-8", "replace")
+                    if first:
+                        raise ValueError(message)
+                    # A later chunk failing is treated like a timeout: keep the pages already read
+                    sys.stderr.write(f"PDF extraction failed after {pages} pages of {pdf_path}: {message}\n")
+                    return
+                if kind == b"n":
+                    remaining.extend(_page_ranges(int(payload), workers)[1:])
+                elif kind == b"p":
+                    pages += 1
+                    yield payload.decode("utf-8", "surrogatepass")
+                top_up()
+            readers.popleft().close()
+            first = False
+            top_up()
+    except TimeoutError:
+        sys.stderr.write(f"PDF extraction budget ({time_budget}s) hit after {pages} pages of {pdf_path}\n")
+    finally:
+        while readers:
+            readers.popleft().close()
+
+
+def iter_pdf_pages(pdf_path, max_pages=MAX_PAGES, time_budget=TIME_BUDGET, workers=1):
+    # Yields the text of each page, lazily, in order
+    yield from _iter_pages(pdf_path, max_pages, None, time_budget, workers)
+
+
+def extract_text(pdf_path, max_pages=MAX_PAGES, max_chars=MAX_CHARS, time_budget=TIME_BUDGET, workers=PDF_WORKERS):
+    parts = []
+    total = 0
+    pages = _iter_pages(pdf_path, max_pages, max_chars, time_budget, workers)
+    try:
+        for text in pages:
+            parts.append(text)
+            total += len(text)
+            if max_chars and total >= max_chars:
+                break
+    finally:
+        pages.close()
+
+    text = "".join(parts)
+    return text[:max_chars] if max_chars else text
@@ -0,0 +1,144 @@
+# response_cache.py
+# Content-addressed cache for LLM responses (ATS scores, JD matches, summaries).
+#
+# Keys are a SHA-256 of (model name, prompt template version, inputs), so the
+# same resume scored against the same JD with the same prompt is answered
+# without calling Gemini. Two tiers:
+#   - an in-process LRU (OrderedDict) for repeats within one worker
+#   - a SQLite file shared by every worker process, with TTL and a row cap
+#     (connections are handled by sqlite_store.py)
+# Values must be JSON-serialisable.
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from metrics import metrics
+from sqlite_store import SQLiteStore
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "llm_responses.sqlite")
+DEFAULT_TTL = 7 * 24 * 3600  # seconds
+DEFAULT_MEMORY_ITEMS = 512
+DEFAULT_MAX_ROWS = 50000
+EVICT_EVERY = 100  # writes between disk eviction sweeps
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY, value TEXT NOT NULL,
+    created_at REAL NOT NULL, accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at);
+"""
+
+
+def cache_key(model_name, template_version, *parts):
+    digest = hashlib.sha256()
+    for part in (model_name, template_version) + parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, path=DEFAULT_PATH, ttl=DEFAULT_TTL, memory_items=DEFAULT_MEMORY_ITEMS,
+                 max_rows=DEFAULT_MAX_ROWS, enabled=True):
+        self.ttl = ttl
+        self.memory_items = memory_items
+        self.max_rows = max_rows
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0}
+        self._memory = OrderedDict()
+        # Guards the in-process LRU; the store has its own lock for the connection
+        self._lock = threading.Lock()
+        self.store = SQLiteStore(path, SCHEMA, "Response cache", enabled=enabled)
+
+    def _remember(self, key, created_at, value):
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        if not self.store.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and now - entry[0] < self.ttl:
+                self._memory.move_to_end(key)
+                self.counters["memory_hits"] += 1
+                metrics.inc("cache_requests_total", cache="response", result="memory_hit")
+                return entry[1]
+            self._memory.pop(key, None)
+
+            def load(db):
+                row = db.execute("SELECT value, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+                if not row or now - row["created_at"] >= self.ttl:
+                    return None
+                db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+                db.commit()
+                return row
+
+            row = self.store.run(load)
+            if row is not None:
+                value = json.loads(row["value"])
+                self._remember(key, row["created_at"], value)
+                self.counters["disk_hits"] += 1
+                metrics.inc("cache_requests_total", cache="response", result="disk_hit")
+                return value
+
+            self.counters["misses"] += 1
+            metrics.inc("cache_requests_total", cache="response", result="miss")
+            return None
+
+    def set(self, key, value):
+        if not self.store.enabled:
+            return
+        now = time.time()
+
+        def write(db):
+            db.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now),
+            )
+            self.counters["writes"] += 1
+            if self.counters["writes"] % EVICT_EVERY == 0:
+                self._evict(db, now)
+            db.commit()
+
+        with self._lock:
+            self._remember(key, now, value)
+            self.store.run(write)
+
+    def _evict(self, db, now):
+        db.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+        (rows,) = db.execute("SELECT COUNT(*) FROM responses").fetchone()
+        if rows > self.max_rows:
+            db.execute(
+                "DELETE FROM responses WHERE key IN"
+                " (SELECT key FROM responses ORDER BY accessed_at ASC LIMIT ?)",
+                (rows - self.max_rows,),
+            )
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def stats(self):
+        hits = self.counters["memory_hits"] + self.counters["disk_hits"]
+        lookups = hits + self.counters["misses"]
+        return dict(self.counters, hit_rate=round(hits / lookups, 3) if lookups else 0.0)
+
+
+# ✅ Shared instance used by skill_extractor.py, ats_matcher.py and resume.py
+response_cache = ResponseCache(
+    path=os.getenv("RESPONSE_CACHE_PATH", DEFAULT_PATH),
+    ttl=float(os.getenv("RESPONSE_CACHE_TTL", DEFAULT_TTL)),
+    memory_items=int(os.getenv("RESPONSE_CACHE_MEMORY_ITEMS", DEFAULT_MEMORY_ITEMS)),
+    max_rows=int(os.getenv("RESPONSE_CACHE_MAX_ROWS", DEFAULT_MAX_ROWS)),
+    enabled=os.getenv("RESPONSE_CACHE_DISABLED", "") not in ("1", "true"),
+)
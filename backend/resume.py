@@ -2,16 +2,21 @@ import os
 import sys
 import json
 from dotenv import load_dotenv
-import google.generativeai as genai
-# Import specific exception for API errors, including quota
-from google.api_core.exceptions import ResourceExhausted, GoogleAPIError
+from response_cache import response_cache, cache_key
+from llm_client import llm_client, PRIORITY_INTERACTIVE
+from metrics import metrics
 
+# ✅ google.generativeai is only imported (by llm_client) when a summary isn't cached
 load_dotenv()
 api_key = os.getenv("GEMINI_API_KEY")
-genai.configure(api_key=api_key)
+llm_client.configure(api_key=api_key)
 
-def query_llm_with_all_info(name, goal, skills, education, experience, projects):
-    prompt = f"""You are a resume writing assistant.
+MODEL_NAME = "models/gemini-1.5-flash-latest"
+# Bump whenever the prompt below changes so cached summaries are not reused
+SUMMARY_PROMPT_VERSION = "summary-v1"
+
+def build_prompt(name, goal, skills, education, experience, projects):
+    return f"""You are a resume writing assistant.
 Write a professional, first-person resume summary in 3 crisp lines. Use "I" instead of third-person names.
 Keep the tone confident but authentic — suitable for job applications.
 
@@ -26,14 +31,27 @@ Projects: {', '.join([f"{p['title']} - {p['description']}" for p in projects])}
 Start directly with the summary. Do not repeat the inputs.
 """
 
+def query_llm_with_all_info(name, goal, skills, education, experience, projects):
+    prompt = build_prompt(name, goal, skills, education, experience, projects)
+
+    # Same details and same prompt -> same summary; skip the Gemini call
+    key = cache_key(MODEL_NAME, SUMMARY_PROMPT_VERSION, prompt)
+    cached = response_cache.get(key)
+    if cached is not None:
+        return cached
+
+    # Import specific exception for API errors, including quota
+    from google.api_core.exceptions import ResourceExhausted, GoogleAPIError
     try:
-        model = genai.GenerativeModel("models/gemini-1.5-flash-latest")
-        response = model.generate_content(prompt)
+        # Interactive priority: summaries jump ahead of bulk internship scoring
+        response_text = llm_client.generate(prompt, MODEL_NAME, priority=PRIORITY_INTERACTIVE)
         # Log full response for debugging purposes to stderr
-        print("✅ Gemini API Response:", response.text, file=sys.stderr)
+        print("✅ Gemini API Response:", response_text, file=sys.stderr)
         
         # Extract and return the first 3 non-empty lines as summary
-        return [line.strip() for line in response.text.split('\n') if line.strip()][:3]
+        summary = [line.strip() for line in response_text.split('\n') if line.strip()][:3]
+        response_cache.set(key, summary)
+        return summary
         
     except ResourceExhausted as e:
         # Specifically catch quota exhaustion error
@@ -57,15 +75,18 @@ if __name__ == "__main__":
         resume_data = json.loads(raw)
         
         # Call the function, it will handle errors and exit if necessary
-        summary = query_llm_with_all_info(
-            resume_data.get("name", ""),
-            resume_data.get("goal", ""),
-            resume_data.get("skills", []),
-            resume_data.get("education", []),
-            resume_data.get("experience", []),
-            resume_data.get("projects", [])
-        )
-        
+        with metrics.timer("summary_seconds"):
+            summary = query_llm_with_all_info(
+                resume_data.get("name", ""),
+                resume_data.get("goal", ""),
+                resume_data.get("skills", []),
+                resume_data.get("education", []),
+                resume_data.get("experience", []),
+                resume_data.get("projects", [])
+            )
+        # stdout stays a bare JSON array for server.js; metrics go to METRICS_TEXTFILE
+        metrics.write_textfile()
+
         # If the script reaches this point, it means summary generation was successful
         print(json.dumps(summary))
         
@@ -0,0 +1,173 @@
+# resume_cache.py
+# Fingerprint cache for uploaded resumes, so re-uploading the same PDF (or a
+# re-export of it) doesn't re-run PDF parsing, spaCy, the scrape and scoring.
+#
+#   uploads   SHA-256 of the PDF bytes -> fingerprint of its text
+#   parsed    text fingerprint -> extracted text and skills
+#   results   (text fingerprint, variant) -> the last ranked result
+#
+# The text fingerprint hashes the text after Unicode (NFKC) normalisation,
+# case folding and collapsing punctuation/whitespace, so two exports of the
+# same resume with different PDF bytes still share one entry. Parsed entries
+# live for RESUME_CACHE_TTL; ranked results only for RESUME_RESULT_TTL, since
+# listings change. Old and least recently used rows are evicted past
+# RESUME_CACHE_MAX_ROWS. Connections are handled by sqlite_store.py, and cache
+# failures never fail a job.
+import hashlib
+import json
+import os
+import re
+import time
+import unicodedata
+
+from metrics import metrics
+from sqlite_store import SQLiteStore
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "resumes.sqlite")
+DEFAULT_TTL = 30 * 24 * 3600  # seconds
+DEFAULT_RESULT_TTL = 6 * 3600
+DEFAULT_MAX_ROWS = 5000
+EVICT_EVERY = 50  # writes between eviction sweeps
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS uploads (
+    pdf_hash TEXT PRIMARY KEY, text_hash TEXT NOT NULL, seen_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS parsed (
+    text_hash TEXT PRIMARY KEY, version TEXT NOT NULL, text TEXT NOT NULL, skills TEXT NOT NULL,
+    created_at REAL NOT NULL, accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS parsed_accessed ON parsed (accessed_at);
+CREATE TABLE IF NOT EXISTS results (
+    text_hash TEXT NOT NULL, variant TEXT NOT NULL, result TEXT NOT NULL, ranked_at REAL NOT NULL,
+    PRIMARY KEY (text_hash, variant)
+);
+"""
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def text_fingerprint(text):
+    normalized = unicodedata.normalize("NFKC", text).casefold()
+    normalized = re.sub(r"[\W_]+", " ", normalized).strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class ResumeCache:
+    def __init__(self, path=DEFAULT_PATH, ttl=DEFAULT_TTL, result_ttl=DEFAULT_RESULT_TTL,
+                 max_rows=DEFAULT_MAX_ROWS, enabled=True):
+        self.ttl = ttl
+        self.result_ttl = result_ttl
+        self.max_rows = max_rows
+        self.counters = {"upload_hits": 0, "text_hits": 0, "parse_misses": 0, "result_hits": 0,
+                         "result_misses": 0, "writes": 0}
+        self.store = SQLiteStore(path, SCHEMA, "Resume cache", enabled=enabled)
+
+    # --- parsed resumes ---
+
+    def get_parsed(self, version, pdf_hash=None, text_hash=None):
+        # {"text_hash", "text", "skills"} for an upload seen before (by PDF hash) or a
+        # resume with the same normalised text, parsed by the same `version`; else None
+        now = time.time()
+
+        def query(db):
+            if pdf_hash is not None:
+                row = db.execute("SELECT p.* FROM uploads u JOIN parsed p ON p.text_hash = u.text_hash"
+                                 " WHERE u.pdf_hash = ?", (pdf_hash,)).fetchone()
+            else:
+                row = db.execute("SELECT * FROM parsed WHERE text_hash = ?", (text_hash,)).fetchone()
+            if not row or row["version"] != version or now - row["created_at"] > self.ttl:
+                return None
+            db.execute("UPDATE parsed SET accessed_at = ? WHERE text_hash = ?", (now, row["text_hash"]))
+            db.commit()
+            return {"text_hash": row["text_hash"], "text": row["text"], "skills": json.loads(row["skills"])}
+
+        parsed = self.store.run(query)
+        if self.store.enabled:
+            counter = "parse_misses" if parsed is None else "upload_hits" if pdf_hash is not None else "text_hits"
+            self.counters[counter] += 1
+            metrics.inc("cache_requests_total", cache="resume_parsed",
+                        result="miss" if parsed is None else "upload_hit" if pdf_hash is not None else "text_hit")
+        return parsed
+
+    def save_parsed(self, version, pdf_hash, text_hash, text, skills):
+        now = time.time()
+
+        def write(db):
+            db.execute("INSERT OR REPLACE INTO uploads (pdf_hash, text_hash, seen_at) VALUES (?, ?, ?)",
+                       (pdf_hash, text_hash, now))
+            db.execute("INSERT OR REPLACE INTO parsed (text_hash, version, text, skills, created_at, accessed_at)"
+                       " VALUES (?, ?, ?, ?, ?, ?)", (text_hash, version, text, json.dumps(skills), now, now))
+            self._written(db, now)
+            db.commit()
+        self.store.run(write)
+
+    def remember_upload(self, pdf_hash, text_hash):
+        # A new PDF whose text matched an existing entry: map its bytes to that entry too
+        def write(db):
+            db.execute("INSERT OR REPLACE INTO uploads (pdf_hash, text_hash, seen_at) VALUES (?, ?, ?)",
+                       (pdf_hash, text_hash, time.time()))
+            db.commit()
+        self.store.run(write)
+
+    # --- ranked results ---
+
+    def get_result(self, text_hash, variant):
+        def query(db):
+            row = db.execute("SELECT result, ranked_at FROM results WHERE text_hash = ? AND variant = ?",
+                             (text_hash, variant)).fetchone()
+            if not row or time.time() - row["ranked_at"] > self.result_ttl:
+                return None
+            return json.loads(row["result"])
+
+        result = self.store.run(query)
+        if self.store.enabled:
+            self.counters["result_hits" if result is not None else "result_misses"] += 1
+            metrics.inc("cache_requests_total", cache="resume_result", result="hit" if result is not None else "miss")
+        return result
+
+    def save_result(self, text_hash, variant, result):
+        now = time.time()
+
+        def write(db):
+            db.execute("INSERT OR REPLACE INTO results (text_hash, variant, result, ranked_at) VALUES (?, ?, ?, ?)",
+                       (text_hash, variant, json.dumps(result), now))
+            self._written(db, now)
+            db.commit()
+        self.store.run(write)
+
+    # --- eviction ---
+
+    def _written(self, db, now):
+        self.counters["writes"] += 1
+        if self.counters["writes"] % EVICT_EVERY == 0:
+            self._evict(db, now)
+
+    def _evict(self, db, now):
+        db.execute("DELETE FROM parsed WHERE created_at < ?", (now - self.ttl,))
+        (rows,) = db.execute("SELECT COUNT(*) FROM parsed").fetchone()
+        if rows > self.max_rows:
+            db.execute("DELETE FROM parsed WHERE text_hash IN"
+                       " (SELECT text_hash FROM parsed ORDER BY accessed_at ASC LIMIT ?)", (rows - self.max_rows,))
+        db.execute("DELETE FROM results WHERE ranked_at < ? OR text_hash NOT IN (SELECT text_hash FROM parsed)",
+                   (now - self.result_ttl,))
+        db.execute("DELETE FROM uploads WHERE text_hash NOT IN (SELECT text_hash FROM parsed)")
+
+    def stats(self):
+        return dict(self.counters)
+
+
+# ✅ Shared cache; RESUME_CACHE_DISABLED=1 always reprocesses uploads
+resume_cache = ResumeCache(
+    path=os.getenv("RESUME_CACHE_PATH", DEFAULT_PATH),
+    ttl=float(os.getenv("RESUME_CACHE_TTL", DEFAULT_TTL)),
+    result_ttl=float(os.getenv("RESUME_RESULT_TTL", DEFAULT_RESULT_TTL)),
+    max_rows=int(os.getenv("RESUME_CACHE_MAX_ROWS", DEFAULT_MAX_ROWS)),
+    enabled=os.getenv("RESUME_CACHE_DISABLED", "") not in ("1", "true"),
+)
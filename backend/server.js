@@ -17,6 +17,7 @@ import User from './models/User.js'; // adjust the path if it's different
 import TrackedInternship from './models/TrackedInternship.js';
 import { fetchGitHubProfile } from './github/tempFile.js';
 import atsScoreRoute from './routes/atsScore.js';
+import { runExtractor, warmExtractor } from './workers/extractorPool.js';
 
 
 dotenv.config();
@@ -31,77 +32,80 @@ app.use(express.json());
 
 const upload = multer({ dest: 'uploads/' });
 
-// ✅ Python resume extractor route
-app.post('/api/upload', upload.single('resume'), (req, res) => {
+// ✅ Python resume extractor route (served by the warm skill_extractor worker pool)
+warmExtractor();
+
+// ?refresh=1 (or a 'refresh' form field) skips the resume cache and reprocesses the upload
+const extractorOptions = (req) => ([req.query.refresh, req.body?.refresh].some((v) => v === '1' || v === 'true')
+    ? { refresh: true } : {});
+
+app.post('/api/upload', upload.single('resume'), async (req, res) => {
   const uploadedPath = path.resolve(__dirname, req.file.path);
-  const pythonPath = 'python3'; // or 'python'
-  const scriptPath = path.resolve(__dirname, 'skill_extractor.py');
-
-  exec(`"${pythonPath}" "${scriptPath}" "${uploadedPath}"`, {
-      env: {
-          ...process.env,
-          PATH: `${path.join(__dirname, 'venv/bin')}:${process.env.PATH}`,
-          VIRTUAL_ENV: path.resolve(__dirname, 'venv')
-      }
-  }, (err, stdout, stderr) => {
+
+  let pythonOutput;
+  try {
+      pythonOutput = await runExtractor(uploadedPath, null, extractorOptions(req));
+  } finally {
       // IMPORTANT: Ensure the uploaded file is cleaned up regardless of outcome
       fs.unlink(uploadedPath, (unlinkErr) => {
           if (unlinkErr) console.error("Error deleting uploaded file:", unlinkErr);
       });
+  }
 
-      // Log both stdout and stderr for full debugging context
-      console.log("Python script raw stdout:\n", stdout);
-      if (stderr) console.error("Python script raw stderr:\n", stderr);
-
-
-      if (err) { // Python script exited with a non-zero code
-          console.error("❌ Python Execution Error (exit code !== 0):", err);
-          
-          try {
-              const errorOutput = JSON.parse(stdout); // Attempt to parse stdout as JSON error
-              if (errorOutput.error === "Gemini_Quota_Exhausted") {
-                  // If skill_extractor.py explicitly signals quota exhaustion
-                  return res.status(429).json({ 
-                      error: "AI assistant is currently unavailable due to quota limits.",
-                      reason: errorOutput.message 
-                  });
-              } else {
-                  // Other types of structured errors from the Python script
-                  return res.status(500).json({ 
-                      error: `Python script error: ${errorOutput.error || 'Unknown'}`, 
-                      reason: errorOutput.message || stdout 
-                  });
-              }
-          } catch (jsonParseError) {
-              // If stdout is not valid JSON when an error occurred, it's a generic script failure
-              console.error("❌ Failed to parse Python script stdout as JSON (during error):", jsonParseError);
-              return res.status(500).json({ 
-                  error: "Python script execution failed.", 
-                  reason: stderr || err.message || stdout // Provide stderr, exec error message, or raw stdout
-              });
-          }
+  if (pythonOutput.error) {
+      console.error("❌ Python worker returned an error:", pythonOutput);
+      if (pythonOutput.error === "Gemini_Quota_Exhausted") {
+          // If skill_extractor.py explicitly signals quota exhaustion
+          return res.status(429).json({ 
+              error: "AI assistant is currently unavailable due to quota limits.",
+              reason: pythonOutput.message 
+          });
       }
+      // Other types of structured errors from the Python script
+      return res.status(500).json({ 
+          error: `Python script error: ${pythonOutput.error || 'Unknown'}`, 
+          reason: pythonOutput.message 
+      });
+  }
 
-      // If execution was successful (err is null or code is 0)
-      try {
-          // Attempt to parse stdout as JSON for successful execution
-          const pythonOutput = JSON.parse(stdout);
-
-          if (pythonOutput && Array.isArray(pythonOutput.internships)) {
-              // Successfully parsed and found the 'internships' array
-              return res.status(200).json({ internships: pythonOutput.internships });
-          } else {
-              // stdout was valid JSON, but didn't contain the expected 'internships' array
-              console.error("❌ Python script output did not contain 'internships' array:", pythonOutput);
-              return res.status(500).json({ error: "Invalid output format from Python script." });
-          }
-      } catch (jsonParseError) {
-          // stdout was not valid JSON for a successful response (unexpected)
-          console.error("❌ Failed to parse Python script stdout as JSON (during success):", jsonParseError);
-          console.error("Raw stdout causing parse error:", stdout);
-          return res.status(500).json({ error: "Invalid or malformed JSON output from Python script." });
-      }
+  if (Array.isArray(pythonOutput.internships)) {
+      // Per-job timings/counters, present when the workers run with METRICS_ENABLED=1
+      if (pythonOutput.metrics) console.log("📊 skill_extractor metrics:", JSON.stringify(pythonOutput.metrics));
+      return res.status(200).json({ internships: pythonOutput.internships, metrics: pythonOutput.metrics });
+  }
+
+  // The worker answered, but without the expected 'internships' array
+  console.error("❌ Python script output did not contain 'internships' array:", pythonOutput);
+  return res.status(500).json({ error: "Invalid output format from Python script." });
+});
+
+// ✅ Streaming variant of /api/upload (Server-Sent Events): the extracted skills and each
+// scored internship are pushed as soon as they're ready, then one 'done' event carries
+// the same payload /api/upload would return ({ internships } or { error, message }).
+app.post('/api/upload/stream', upload.single('resume'), async (req, res) => {
+  const uploadedPath = path.resolve(__dirname, req.file.path);
+
+  res.set({
+      'Content-Type': 'text/event-stream',
+      'Cache-Control': 'no-cache',
+      'Connection': 'keep-alive',
   });
+  res.flushHeaders();
+
+  const send = (event, data) => res.write(`event: ${event}\ndata: ${JSON.stringify(data)}\n\n`);
+
+  let pythonOutput;
+  try {
+      pythonOutput = await runExtractor(uploadedPath, ({ event, ...data }) => send(event, data), extractorOptions(req));
+  } finally {
+      fs.unlink(uploadedPath, (unlinkErr) => {
+          if (unlinkErr) console.error("Error deleting uploaded file:", unlinkErr);
+      });
+  }
+
+  if (pythonOutput.error) console.error("❌ Python worker returned an error:", pythonOutput);
+  send('done', pythonOutput);
+  res.end();
 });
 
 
@@ -1,275 +1,340 @@
-import requests
-from bs4 import BeautifulSoup
-import fitz  # PyMuPDF
-import spacy
-import nltk
-from nltk.corpus import stopwords
 import re
 import csv
-import datetime
 import os
 import sys
 from dotenv import load_dotenv
-import google.generativeai as genai
 import time
 import json
-# Import specific error types from google.api_core.exceptions
-from google.api_core.exceptions import ResourceExhausted, GoogleAPIError, Aborted
-
-# ✅ Load environment and configure Gemini
+import hashlib
+import argparse
+import heapq
+import importlib
+import signal
+import threading
+import multiprocessing
+from skill_taxonomy import skill_taxonomy
+from stop_words_en import STOP_WORDS
+from response_cache import response_cache, cache_key
+from llm_client import llm_client, PRIORITY_BULK
+from listing_store import listing_store
+from resume_cache import resume_cache, file_hash, text_fingerprint
+from debug_log import log_to_csv
+from metrics import metrics
+
+# ✅ Heavy dependencies (spaCy, bs4, requests, PyMuPDF, numpy, google.generativeai)
+# are imported on the code paths that use them, so --help, usage and input errors
+# return in a fraction of a second. --serve preloads them before forking workers.
+PRELOAD_MODULES = ["bs4", "pdf_text", "http_pool", "local_scorer", "job_sources", "google.generativeai",
+                   "google.api_core.exceptions"]
+
+# ✅ Load environment and configure Gemini (applied on the first Gemini call)
 load_dotenv()
-genai.configure(
-    api_key=os.getenv("GOOGLE_API_KEY")
-)
-
-# ✅ Ensure NLTK stopwords are available
-nltk.data.path.append(os.path.join(os.path.dirname(__file__), "nltk_data"))
-try:
-    stop_words = set(stopwords.words('english'))
-except LookupError:
-    nltk.download('stopwords')
-    stop_words = set(stopwords.words('english'))
-
-nlp = spacy.load("en_core_web_sm")
+llm_client.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+
+# ✅ Prebuilt from the NLTK corpus by demo.py; never downloaded at runtime
+stop_words = STOP_WORDS
+
+# ✅ extract_skills only reads token.text / token.is_punct, which the tokenizer sets on
+# its own, so by default the tagger, parser, NER etc. are not even loaded.
+# SPACY_MODE=full restores the complete en_core_web_sm pipeline.
+SPACY_MODE = os.getenv("SPACY_MODE", "tokenizer")
+SPACY_UNUSED_COMPONENTS = ["tok2vec", "tagger", "parser", "senter", "attribute_ruler", "lemmatizer", "ner"]
+_nlp = None
+
+def get_nlp():
+    global _nlp
+    if _nlp is None:
+        import spacy
+        if SPACY_MODE == "full":
+            _nlp = spacy.load("en_core_web_sm")
+        else:
+            _nlp = spacy.load("en_core_web_sm", exclude=SPACY_UNUSED_COMPONENTS)
+    return _nlp
 
 top_n = 10
-# SKILL_KEYWORDS (unchanged - keep your full list here)
-SKILL_KEYWORDS = [
-    # 🧠 Broad Skill Domains / Roles
-    "frontend developer", "backend developer", "fullstack developer", "data scientist",
-    "data analyst", "machine learning", "deep learning", "artificial intelligence",
-    "ai engineer", "nlp", "computer vision", "data science", "mle", "dl", "ai", "ml",
-    "devops", "mobile developer", "web3 developer", "game developer", "cloud engineer",
-    "qa engineer", "automation tester", "security analyst", "c++", "python", "html", "css",
-
-    # 🌐 Frontend Frameworks & Tools
-    "react.js", "vue.js", "next.js", "svelte", "tailwind css", "bootstrap", "chakra ui",
-    "material ui", "vite", "framer motion", "styled components", "gsap",
-
-    # 🔧 Backend Frameworks & Tools
-    "express.js", "nestjs", "hapi.js", "adonisjs", "laravel", "symfony", "fastapi",
-    "asp.net core", "rails", "gin gonic", "actix", "spring boot", "fiber",
-
-    # 🤖 Machine Learning / AI
-    "scikit-learn", "xgboost", "lightgbm", "catboost", "pytorch", "tensorflow",
-    "keras", "onnx", "mlflow", "huggingface transformers", "openvino", "deepspeed",
-    "fastai", "auto-sklearn", "tpot", "wandb", "optuna",
-
-    # 💬 NLP Tools & Libraries
-    "nltk", "spacy", "textblob", "gensim", "polyglot", "stanford nlp", "flair nlp",
-    "huggingface", "transformers", "bert", "roberta", "gpt", "sentence-transformers",
-
-    # 📊 Data Science & Analytics
-    "power bi", "tableau", "looker", "superset", "metabase", "seaborn", "matplotlib",
-    "plotly", "bokeh", "pandas profiling", "sweetviz", "datapane", "dvc",
-
-    # 🗃️ Databases & Storage
-    "mongodb", "postgresql", "redis", "neo4j", "dynamodb", "elastic search", "supabase",
-    "influxdb", "cassandra", "firebase firestore", "clickhouse", "tidb",
-
-    # ☁️ DevOps / Cloud
-    "docker", "kubernetes", "ansible", "terraform", "jenkins", "prometheus", "grafana",
-    "pagerduty", "argocd", "helm", "azure pipelines", "aws lambda", "gcp cloud run",
-    "cloudflare", "netlify", "vercel",
-
-    # 🔐 Cybersecurity
-    "owasp zap", "burp suite", "metasploit", "nmap", "wireshark", "snort", "splunk", 
-    "suricata", "hashicorp vault", "fail2ban", "crowdstrike",
-
-    # 📱 Mobile App Development
-    "flutter", "react native", "ionic", "xamarin", "kivy", "jetpack compose",
-    "nativebase", "codemagic",
-
-    # 🎮 Game Development / Graphics
-    "unity", "unreal engine", "godot", "three.js", "babylon.js", "blender",
-    "panda3d", "playcanvas",
-
-    # 🌍 Web3 / Blockchain
-    "solidity", "ethers.js", "web3.js", "hardhat", "truffle", "alchemy", "moralis",
-    "polygon", "chainlink", "ipfs", "pinata", "foundry",
-
-    # 🧪 Testing / QA
-    "cypress", "playwright", "jest", "mocha", "chai", "postman", "newman", "selenium",
-    "testcafe", "allure", "jmeter",
-
-    # 🧠 Specialized AI Use Cases
-    "ocr", "image segmentation", "object detection", "face recognition",
-    "pose estimation", "edge ai", "tinyml", "autonomous agents", "rasa", "langchain"
-]
+ATS_MODEL_NAME = "gemini-1.5-flash"
+# Bump whenever the get_ats_score/get_ats_scores prompts change so cached scores are not reused
+ATS_PROMPT_VERSION = "ats-score-v1"
+# Number of job descriptions packed into one Gemini scoring call
+ATS_BATCH_SIZE = int(os.getenv("ATS_BATCH_SIZE", "5"))
+SCORING_MODES = ("llm", "local", "hybrid")
+SCORING_MODE = os.getenv("SCORING_MODE", "llm")
+# In hybrid mode, how many locally pre-ranked listings get a Gemini score
+HYBRID_TOP_K = int(os.getenv("HYBRID_TOP_K", "5"))
+# Stage sizes: cards read from the search page, eligible listings pre-ranked locally
+INITIAL_SCRAPE_LIMIT = int(os.getenv("INITIAL_SCRAPE_LIMIT", "50"))
+PREFILTER_LIMIT = int(os.getenv("PREFILTER_LIMIT", "30"))
+# One keep-alive session (with per-host limits and timeouts) for every scrape request
+_http = None
+
+def get_http():
+    global _http
+    if _http is None:
+        from http_pool import PooledSession
+        _http = PooledSession()
+    return _http
+
+def preload():
+    # --serve: load the models and heavy modules once in the parent so forked workers start warm
+    get_nlp()
+    for module in PRELOAD_MODULES:
+        importlib.import_module(module)
+
+def gemini_error_type(e):
+    # "Gemini_Quota_Exhausted" / "Gemini_API_Error" for google.api_core errors, else None.
+    # google.api_core is only loaded once Gemini has been called, and only then can e be one of its errors.
+    exceptions = sys.modules.get("google.api_core.exceptions")
+    if exceptions is None or not isinstance(e, exceptions.GoogleAPIError):
+        return None
+    return "Gemini_Quota_Exhausted" if isinstance(e, exceptions.ResourceExhausted) else "Gemini_API_Error"
 
 def extract_text_from_pdf(pdf_path):
-    doc = fitz.open(pdf_path)
-    return "".join([page.get_text() for page in doc])
+    # Bounded by PDF_MAX_PAGES / PDF_MAX_CHARS / PDF_TIME_BUDGET, see pdf_text.py
+    import pdf_text
+    with metrics.timer("pdf_parse_seconds"):
+        return pdf_text.extract_text(pdf_path)
+
+def _skills_from_doc(doc):
+    with metrics.timer("skill_match_seconds"):
+        clean_tokens = [token.text for token in doc if token.text not in stop_words and not token.is_punct]
+        text_clean = " ".join(clean_tokens)
+        # ✅ One scan over the precompiled taxonomy index; aliases come back as canonical
+        # names ("reactjs" -> "react.js"), in taxonomy order
+        return skill_taxonomy.ordered(skill_taxonomy.find(text_clean))
 
 def extract_skills(text):
     text_lower = text.lower()
-    found_skills = set()
-    doc = nlp(text_lower)
-    clean_tokens = [token.text for token in doc if token.text not in stop_words and not token.is_punct]
-    text_clean = " ".join(clean_tokens)
-    for skill in sorted(SKILL_KEYWORDS, key=len, reverse=True):
-        pattern = r'\b' + re.escape(skill) + r'\b'
-        if re.search(pattern, text_clean):
-            found_skills.add(skill)
-            text_clean = re.sub(pattern, '', text_clean)
-    return list(found_skills)
-
-def get_ats_score(resume_text, job_description):
-    # Modified: Reduced retries from 5 to 2
-    retries = 2
-    base_delay = 5
-    model_name = "gemini-1.5-flash"
-
-    for attempt in range(retries):
-        try:
-            prompt = f"""
+    with metrics.timer("spacy_seconds"):
+        doc = get_nlp()(text_lower)
+    return _skills_from_doc(doc)
+
+def extract_skills_many(texts, n_process=1, batch_size=64):
+    # Batch variant for bulk imports: one nlp.pipe call instead of one nlp() per resume
+    # (nlp.pipe is lazy, so spaCy time here includes the matching)
+    with metrics.timer("spacy_seconds", batched=True):
+        docs = get_nlp().pipe((text.lower() for text in texts), n_process=n_process, batch_size=batch_size)
+        return [_skills_from_doc(doc) for doc in docs]
+
+# Skills cached in the resume cache are only reused if extracted the same way
+RESUME_PARSE_VERSION = f"{SPACY_MODE}:{skill_taxonomy.version[:12]}"
+
+def parse_resume(pdf_path, refresh=False):
+    # ✅ (text, skills, text_hash). PDF parsing and spaCy are skipped for a PDF seen before,
+    # or for a different PDF with the same normalised text; refresh=True always reparses.
+    pdf_hash = file_hash(pdf_path)
+    parsed = None if refresh else resume_cache.get_parsed(RESUME_PARSE_VERSION, pdf_hash=pdf_hash)
+    if parsed:
+        log_to_csv("Resume From Cache", pdf_path)
+        return parsed["text"], parsed["skills"], parsed["text_hash"]
+    text = extract_text_from_pdf(pdf_path)
+    text_hash = text_fingerprint(text)
+    parsed = None if refresh else resume_cache.get_parsed(RESUME_PARSE_VERSION, text_hash=text_hash)
+    if parsed:
+        log_to_csv("Resume Text From Cache", pdf_path)
+        resume_cache.remember_upload(pdf_hash, text_hash)
+        return text, parsed["skills"], text_hash
+    skills = extract_skills(text)
+    resume_cache.save_parsed(RESUME_PARSE_VERSION, pdf_hash, text_hash, text, skills)
+    return text, skills, text_hash
+
+def _ats_cache_key(resume_text, job_description):
+    # Single and batched prompts ask the same question, so they share cache entries
+    return cache_key(ATS_MODEL_NAME, ATS_PROMPT_VERSION, resume_text[:3000], job_description[:3000])
+
+def get_ats_score(resume_text, job_description, degraded=None):
+    # ✅ Re-uploads and refreshes rescore the same resume/JD pair: answer from cache.
+    # An unparseable answer scores 0 and is noted in `degraded`, if given
+    score_key = _ats_cache_key(resume_text, job_description)
+    cached_score = response_cache.get(score_key)
+    if cached_score is not None:
+        return cached_score
+
+    prompt = f"""
 You are an ATS. Rate the resume for the job from 0–100. Return only a number.
 
 Resume: {resume_text[:3000]}
 Job Description: {job_description[:3000]}
 """
-            model = genai.GenerativeModel("gemini-1.5-flash")
-            response = model.generate_content(prompt)
-            
-            score_match = re.findall(r'\d+', response.text)
-            if score_match:
-                score = int(score_match[0])
-            else:
-                score = 0
-            return score
+    response_text = llm_client.generate(prompt, ATS_MODEL_NAME, priority=PRIORITY_BULK)
+
+    score_match = re.search(r'\d+', response_text)
+    if not score_match:
+        # Don't cache a non-answer: the next upload asks Gemini again
+        sys.stderr.write(f"ATS response had no score: {response_text[:200]!r}\n")
+        log_to_csv("ATS Score Unparsed", response_text[:200])
+        if degraded is not None:
+            degraded.append("ats: unparsed score")
+        return 0
+    score = max(0, min(100, int(score_match.group(0))))
+    response_cache.set(score_key, score)
+    return score
+
+def _parse_score_array(response_text, expected):
+    # Expects a JSON array of `expected` numbers, possibly wrapped in prose or ```json fences
+    match = re.search(r'\[.*?\]', response_text, re.S)
+    if not match:
+        return None
+    try:
+        values = json.loads(match.group(0))
+    except ValueError:
+        return None
+    if not isinstance(values, list) or len(values) != expected:
+        return None
+    if not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+        return None
+    return [max(0, min(100, int(v))) for v in values]
+
+def get_ats_scores(resume_text, job_descriptions, batch_size=ATS_BATCH_SIZE, degraded=None):
+    # ✅ Scores one resume against many JDs, packing `batch_size` JDs into each
+    # Gemini call so the resume is sent once per batch instead of once per job.
+    # Returns scores in the same order as `job_descriptions`.
+    scores = [None] * len(job_descriptions)
+    pending = []
+    for i, job_description in enumerate(job_descriptions):
+        cached_score = response_cache.get(_ats_cache_key(resume_text, job_description))
+        if cached_score is not None:
+            scores[i] = cached_score
+        else:
+            pending.append(i)
 
-        except (ResourceExhausted, Aborted) as e: # Catch specific quota errors
-            error_message = str(e)
-            sys.stderr.write(f"❌ Gemini scoring error (Attempt {attempt+1}/{retries}): {error_message}\n")
+    for start in range(0, len(pending), max(1, batch_size)):
+        batch = pending[start:start + max(1, batch_size)]
+        if len(batch) == 1:
+            scores[batch[0]] = get_ats_score(resume_text, job_descriptions[batch[0]], degraded)
+            continue
 
-            if "429 You exceeded your current quota" in error_message or isinstance(e, ResourceExhausted):
-                match = re.search(r"retry_delay {\s+seconds: (\d+)", error_message)
-                if match:
-                    delay = int(match.group(1))
-                else:
-                    delay = base_delay * (2 ** attempt)
-
-                sys.stderr.write(f"Retrying in {delay} seconds due to quota limit...\n")
-                if attempt < retries - 1: # Only sleep if there are more retries left
-                    time.sleep(delay)
-                else: # If this is the last attempt and it failed, re-raise
-                    raise # Re-raise if retries exhausted
-            else: # Other GoogleAPIError types might not be retriable for this function
-                sys.stderr.write(f"Non-quota related ResourceExhausted/Aborted error encountered, stopping retries: {error_message}\n")
-                raise # Re-raise if not a quota error or something we handle here
-        except GoogleAPIError as e: # Catch other general API errors
-            sys.stderr.write(f"Non-quota related GoogleAPIError encountered, stopping retries: {str(e)}\n")
-            raise # Re-raise other API errors
-        except Exception as e:
-            sys.stderr.write(f"❌ Unexpected error in get_ats_score (Attempt {attempt+1}/{retries}): {str(e)}\n")
-            raise # Re-raise other unexpected errors
+        jobs_block = "\n\n".join(
+            f"Job {n}: {job_descriptions[i][:3000]}" for n, i in enumerate(batch, 1)
+        )
+        prompt = f"""
+You are an ATS. Rate the resume for each of the {len(batch)} jobs below from 0–100.
+Return only a JSON array of {len(batch)} integers, one score per job in the order given, e.g. [72, 40, 88].
 
-    # If loop finishes without returning, it means retries were exhausted
-    # Due to quota or other unhandled errors that were re-raised.
-    sys.stderr.write(f"❌ Gemini scoring failed after {retries} attempts due to persistent quota limits or other errors.\n")
-    raise ResourceExhausted("Gemini API quota exceeded after multiple retries.")
+Resume: {resume_text[:3000]}
 
+{jobs_block}
+"""
+        batch_scores = _parse_score_array(llm_client.generate(prompt, ATS_MODEL_NAME, priority=PRIORITY_BULK), len(batch))
+        if batch_scores is None:
+            # Malformed batch answer: fall back to one call per job
+            sys.stderr.write(f"Batch ATS response malformed, rescoring {len(batch)} jobs individually\n")
+            log_to_csv("ATS Batch Fallback", f"{len(batch)} jobs")
+            batch_scores = [get_ats_score(resume_text, job_descriptions[i], degraded) for i in batch]
+        else:
+            for i, score in zip(batch, batch_scores):
+                response_cache.set(_ats_cache_key(resume_text, job_descriptions[i]), score)
+
+        for i, score in zip(batch, batch_scores):
+            scores[i] = score
+
+    return scores
 
-def check_eligible(link):
-    headers = {"User-Agent": "Mozilla/5.0"}
-    try:
-        response = requests.get(link, headers=headers)
-        soup = BeautifulSoup(response.text, "html.parser")
-        button = soup.find('button', class_='btn btn-primary top_apply_now_cta')
-        if not button: return False
-        text = button.get_text(strip=True).lower()
-        return "apply now" in text and "login" not in text and "eligible" not in text
-    except Exception as e:
-        sys.stderr.write(f"Error checking {link}: {e}\n")
-        return False
 
 def parse_stipend(stipend_str):
     numbers = [int(n.replace(",", "")) for n in re.findall(r'\d{1,3}(?:,\d{3})*', stipend_str)]
     return max(numbers) if numbers else 0
 
-def convert_link(link):
-    return link.replace("/internship/detail/", "/application/form/")
-
-def scrape_internshala(skills, resume_text, num_to_score=10, initial_scrape_limit=50):
-    skills_slug = ",".join(skills).replace(" ", "-").lower()
-    url = f"https://internshala.com/internships/{skills_slug}-internship"
-    headers = {"User-Agent": "Mozilla/5.0"}
-    
-    eligible_internships_for_scoring = []
-
-    try:
-        response = requests.get(url, headers=headers)
-        soup = BeautifulSoup(response.text, "html.parser")
-        log_to_csv("Scraping Started", f"URL: {url}")
-
-        processed_divs_count = 0 # Track how many divs we've processed
-        for div in soup.find_all("div", class_="individual_internship"):
-            if processed_divs_count >= initial_scrape_limit:
-                break # Stop processing divs if we hit the limit
-            processed_divs_count += 1
-
-            try:
-                title_tag = div.find("a", class_="job-title-href")
-                title = title_tag.text.strip()
-                link = "https://internshala.com" + title_tag["href"]
-                company = div.find("p", class_="company-name").text.strip()
-                location = div.find("div", class_="locations").text.strip()
-                stipend = div.find("span", class_="stipend").text.strip()
-
-                if check_eligible(link):
-                    eligible_internships_for_scoring.append({
-                        "title": title,
-                        "company": company,
-                        "location": location,
-                        "stipend": stipend,
-                        "link": link,
-                        "ats_score": None
-                    })
-                    # Break if we have enough eligible internships to score
-                    if len(eligible_internships_for_scoring) >= num_to_score:
-                        break
-                else:
-                    log_to_csv("Internship Skipped (Not Eligible)", f"{title} - {link}")
-
-            except Exception as e:
-                log_to_csv("Parse Error for Individual Internship", str(e))
-                sys.stderr.write(f"Parse Error for Individual Internship: {e}\n")
-                continue
-
-    except Exception as e:
-        log_to_csv("Scraping Failed for Internshala URL", str(e))
-        sys.stderr.write(f"Scraping Failed for Internshala URL: {e}\n")
-        return []
+def scrape_internships(skills, resume_text, num_to_score=10, initial_scrape_limit=50, sources=None, session=None,
+                       mode=None, prefilter_limit=None, stage_timings=None, on_event=None, degraded=None):
+    # ✅ Staged ranking, cheapest stage first:
+    #   1. sources:   every job source (default: JOB_SOURCES, see job_sources.py) is searched
+    #                 concurrently within its deadline: up to initial_scrape_limit cards and
+    #                 detail pages for up to prefilter_limit eligible listings per source,
+    #                 deduped by company + title
+    #   2. prefilter: each listing gets a cheap local relevance score; a bounded heap
+    #                 keeps the best num_to_score across all sources
+    #   3. scoring:   only the heap survivors are ATS-scored, according to `mode`:
+    #                 "llm" (Gemini scores all), "local" (LocalScorer only, no network) or
+    #                 "hybrid" (local scores pre-rank, only the top HYBRID_TOP_K go to Gemini)
+    # Per-stage wall-clock seconds are written into `stage_timings` if a dict is passed, and
+    # on_event (if given) receives a "listing" event as soon as each listing has its score.
+    # If a `degraded` list is passed, the reasons a ranking came out incomplete (a source
+    # timed out or failed, a score fell back to 0) are appended to it.
+    from local_scorer import local_scorer
+    from job_sources import configured_sources, fan_out
+    mode = mode or SCORING_MODE
+    if mode not in SCORING_MODES:
+        raise ValueError(f"Unknown scoring mode: {mode}")
+    prefilter_limit = prefilter_limit or PREFILTER_LIMIT
+    timings = stage_timings if stage_timings is not None else {}
+    sources = sources or configured_sources()
+    session = session or get_http()
+
+    stage_start = time.perf_counter()
+    found, listed = fan_out(sources, skills, session, listing_limit=initial_scrape_limit,
+                            eligible_limit=prefilter_limit, stage_timings=timings, degraded=degraded)
+    timings["sources"] = round(time.perf_counter() - stage_start, 3)
+
+    stage_start = time.perf_counter()
+    top_candidates = [] # min-heap of (relevance, -page_position, -source_index, job_data, job_desc)
+    for source_index, position, job_data, job_desc in found:
+        entry = (local_scorer.relevance(skills, job_data["title"], job_desc), -position, -source_index, job_data, job_desc)
+        if len(top_candidates) < num_to_score:
+            heapq.heappush(top_candidates, entry)
+        else:
+            heapq.heappushpop(top_candidates, entry) # ties keep the earlier listing, then the earlier source
+    candidates = [(job_data, job_desc) for _, _, _, job_data, job_desc in sorted(top_candidates, reverse=True)]
+    timings["prefilter"] = round(time.perf_counter() - stage_start, 3)
 
     final_scored_internships = []
-    sys.stderr.write(f"\n--- Fetching Job Descriptions and ATS Scores for Top {min(len(eligible_internships_for_scoring), num_to_score)} Internships ---\n")
+    sys.stderr.write(f"\n--- ATS Scoring Top {len(candidates)} of {len(found)} Eligible Internships ({listed} listed, {len(sources)} sources) ---\n")
+    stage_start = time.perf_counter()
 
-    for i, job_data in enumerate(eligible_internships_for_scoring[:num_to_score]):
+    def score_batch(batch, source):
+        sys.stderr.write(f"Processing ATS ({source}) for {len(batch)} internships: {', '.join(job['title'] for job, _ in batch)}\n")
         try:
-            sys.stderr.write(f"Processing ATS for: {job_data['title']} at {job_data['company']} ({i+1}/{min(len(eligible_internships_for_scoring), num_to_score)})\n")
-            
-            job_resp = requests.get(job_data["link"], headers=headers)
-            job_soup = BeautifulSoup(job_resp.text, "html.parser")
-            jd_div = job_soup.find("div", class_="internship_details")
-            job_desc = jd_div.get_text(strip=True) if jd_div else ""
-
-            ats_score = get_ats_score(resume_text, job_desc) # This can now raise exceptions
-            
+            if source == "local":
+                local_results = local_scorer.score_many(resume_text, [job_desc for _, job_desc in batch], skills)
+                scores = [result["score"] for result in local_results]
+                for (job_data, _), result in zip(batch, local_results):
+                    job_data["missing_keywords"] = result["missing_keywords"]
+            else:
+                scores = get_ats_scores(resume_text, [job_desc for _, job_desc in batch], degraded=degraded)
+        except Exception as e:
+            if gemini_error_type(e):
+                # If a Gemini error occurred during scoring, re-raise it
+                # The main block will catch it and format the output for Node.js
+                log_to_csv("ATS Scoring Error (Gemini API)", f"Error for {len(batch)} internships: {str(e)}")
+                raise # Re-raise so the main block catches it
+            log_to_csv("ATS Scoring Error (Other)", f"Error for {len(batch)} internships: {str(e)}")
+            sys.stderr.write(f"ATS Scoring Error (Other): {str(e)}\n")
+            if degraded is not None:
+                degraded.append(f"ats: {len(batch)} scores fell back to 0")
+            scores = [0] * len(batch)
+
+        for (job_data, _), ats_score in zip(batch, scores):
             job_data["ats_score"] = ats_score
+            job_data["score_source"] = source
             final_scored_internships.append(job_data)
-            log_to_csv("ATS Scored", f"{job_data['title']} - ATS: {ats_score}")
-
-        except (ResourceExhausted, GoogleAPIError, Aborted) as e:
-            # If a Gemini error occurred during scoring, re-raise it
-            # The main block will catch it and format the output for Node.js
-            log_to_csv("ATS Scoring Error (Gemini API)", f"Error for {job_data['title']}: {str(e)}")
-            raise # Re-raise so the main block catches it
-        except Exception as e:
-            log_to_csv("ATS Scoring Error (Other)", f"Error for {job_data['title']}: {str(e)}")
-            sys.stderr.write(f"ATS Scoring Error (Other) for {job_data['title']}: {str(e)}\n")
-            job_data["ats_score"] = 0
+            log_to_csv("ATS Scored", f"{job_data['title']} - ATS ({source}): {ats_score}")
+            if on_event:
+                on_event({"event": "listing", "internship": internship_output(job_data)})
+
+    if mode == "hybrid":
+        # Local scores for every candidate, then Gemini only for the best HYBRID_TOP_K
+        local_results = local_scorer.score_many(resume_text, [job_desc for _, job_desc in candidates], skills)
+        for (job_data, _), result in zip(candidates, local_results):
+            job_data["missing_keywords"] = result["missing_keywords"]
+        ranked = sorted(range(len(candidates)), key=lambda i: local_results[i]["score"], reverse=True)
+        # The locally scored tail is final already, so it is reported before waiting on Gemini
+        for i in ranked[HYBRID_TOP_K:]:
+            job_data = candidates[i][0]
+            job_data["ats_score"] = local_results[i]["score"]
+            job_data["score_source"] = "local"
             final_scored_internships.append(job_data)
-            continue # Continue to next job if non-Gemini error
+            if on_event:
+                on_event({"event": "listing", "internship": internship_output(job_data)})
+        if ranked[:HYBRID_TOP_K]:
+            score_batch([candidates[i] for i in ranked[:HYBRID_TOP_K]], "llm")
+    else:
+        for start in range(0, len(candidates), ATS_BATCH_SIZE):
+            score_batch(candidates[start:start + ATS_BATCH_SIZE], mode)
+    timings["scoring"] = round(time.perf_counter() - stage_start, 3)
+
+    sys.stderr.write(f"Stage timings (s): {timings}\n")
+    for stage, seconds in timings.items():
+        metrics.observe("stage_seconds", seconds, stage=stage)
+    log_to_csv("Stage Timings", json.dumps(timings))
 
     def get_ats_value(ats):
         if ats is None:
@@ -295,6 +360,7 @@ def scrape_internshala(skills, resume_text, num_to_score=10, initial_scrape_limi
     sorted_by_ats_then_stipend = sorted(
         final_scored_internships,
         key=lambda x: (
+            x.get('score_source') == "llm" if mode == "hybrid" else True, # Gemini-scored first in hybrid mode
             get_ats_value(x.get('ats_score')), # Use .get for safety
             get_stipend_value(x.get('stipend', '')) # Use .get for safety
         ),
@@ -309,16 +375,7 @@ def save_links_to_txt(internships, filenames=["internship_links.txt", "internshi
             f.write(job["link"] + "\n")
     with open(filenames[1], "w") as f:
         for job in internships:
-            f.write(convert_link(job["link"]) + "\n")
-
-def log_to_csv(event, details="", file_path="debug_log.csv"):
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    file_exists = os.path.isfile(file_path)
-    with open(file_path, mode="a", newline="") as file:
-        writer = csv.writer(file)
-        if not file_exists:
-            writer.writerow(["Timestamp", "Event", "Details"])
-        writer.writerow([timestamp, event, details])
+            f.write(job["apply_link"] + "\n")
 
 def details_to_csv(lod, filename="Details_csv.csv"):
     with open(filename, "w", newline="") as f:
@@ -336,50 +393,282 @@ def details_to_csv(lod, filename="Details_csv.csv"):
         else:
             sys.stderr.write("Warning: No data to write to CSV.\n")
 
-# --- Main execution block ---
-if __name__ == "__main__":
+def internship_output(job):
+    # The shape each internship has in the JSON result (and in streamed "listing" events)
+    return {
+        "title": job['title'],
+        "company": job['company'],
+        "location": job["location"],
+        "stipend": job["stipend"],
+        "link": job["link"],
+        "apply": job["apply_link"],
+        "source": job["source"],
+        "ats": job.get('ats_score', 'N/A'),
+        "score_source": job.get('score_source'),
+        "missing_keywords": job.get('missing_keywords', [])
+    }
+
+def result_variant(mode):
+    # Hash of everything besides the resume that decides the ranked result, so a cached
+    # ranking is only replayed under the same boards, base URLs, limits, prompts and taxonomy
+    from job_sources import configured_sources
+    config = {
+        "mode": mode,
+        "top_n": top_n,
+        "sources": [[source.name, getattr(source, "base_url", None)] for source in configured_sources()],
+        "hybrid_top_k": HYBRID_TOP_K,
+        "initial_scrape_limit": INITIAL_SCRAPE_LIMIT,
+        "prefilter_limit": PREFILTER_LIMIT,
+        "ats": [ATS_MODEL_NAME, ATS_PROMPT_VERSION, ATS_BATCH_SIZE],
+        "taxonomy": skill_taxonomy.version,
+    }
+    digest = hashlib.sha256(json.dumps(config, sort_keys=True).encode("utf-8")).hexdigest()
+    return f"{mode}:{digest[:32]}"
+
+def process_resume(pdf_path, mode=None, on_event=None, refresh=False):
+    # on_event, if given, is called with progress events as they happen:
+    #   {"event": "skills", "skills": [...]}                 once skills are extracted
+    #   {"event": "listing", "internship": {...}}            as each listing is scored
+    # The returned result carries the final ordering.
+    # A resume ranked within RESUME_RESULT_TTL gets its last result back from the resume
+    # cache without scraping or scoring; refresh=True reprocesses it from scratch.
+    mode = mode or SCORING_MODE
+    text, skills, text_hash = parse_resume(pdf_path, refresh)
+    sys.stderr.write(f"Extracted Skills: {skills}\n")
+    if on_event:
+        on_event({"event": "skills", "skills": skills})
+
+    variant = result_variant(mode)
+    cached = None if refresh else resume_cache.get_result(text_hash, variant)
+    if cached is not None:
+        sys.stderr.write(f"Ranked results from resume cache: {resume_cache.stats()}\n")
+        if on_event:
+            for internship in cached["internships"]:
+                on_event({"event": "listing", "internship": internship})
+        return cached
+
+    degraded = []
+    results = scrape_internships(skills, text, num_to_score=top_n, initial_scrape_limit=INITIAL_SCRAPE_LIMIT, mode=mode,
+                                 on_event=on_event, degraded=degraded)
+    
+    results_sorted = results 
+
+    final_output = [internship_output(job) for job in results_sorted[:top_n]]
+
+    save_links_to_txt(results_sorted[:top_n])
+    details_to_csv(results_sorted[:top_n])
+    sys.stderr.write(f"Response cache: {response_cache.stats()}\n")
+    sys.stderr.write(f"Listing store: {listing_store.stats()}\n")
+    sys.stderr.write(f"LLM client: {llm_client.metrics()}\n")
+    sys.stderr.write(f"Resume cache: {resume_cache.stats()}\n")
+
+    result = { "internships": final_output }
+    if degraded:
+        # A ranking missing a source or carrying fallback scores is not worth replaying
+        sys.stderr.write(f"Ranking not cached, run was degraded: {sorted(set(degraded))}\n")
+        log_to_csv("Ranking Not Cached", ", ".join(sorted(set(degraded))))
+    elif final_output:
+        # Nor is an empty one
+        resume_cache.save_result(text_hash, variant, result)
+    return result
+
+def run_job(pdf_path, **options):
+    # Same JSON contract as the one-shot CLI: either {"internships": [...]} or {"error", "message"},
+    # plus this job's "metrics" when METRICS_ENABLED is set
+    metrics.reset()
     try:
-        if len(sys.argv) < 2:
-            sys.stderr.write("Usage: python skill_extractor.py <path_to_your_resume.pdf>\n")
-            sys.exit(1)
-
-        pdf_path = sys.argv[1]
+        with metrics.timer("job_seconds"):
+            result = process_resume(pdf_path, **options)
+    except Exception as e:
+        result = {"error": gemini_error_type(e) or "Script_Execution_Failed", "message": str(e)}
+    if metrics.enabled:
+        result["metrics"] = metrics.snapshot()
+    return result
+
+def write_line(payload):
+    sys.stdout.write(json.dumps(payload) + "\n")
+    sys.stdout.flush()
+
+# Set in each --serve worker: streamed events go back to the parent through it
+_event_queue = None
+
+# A job that has been running in a pool worker this long is failed and its worker
+# killed (the pool starts a replacement). Same variable extractorPool.js reads.
+JOB_TIMEOUT = float(os.getenv("EXTRACTOR_JOB_TIMEOUT_MS", "180000")) / 1000
+
+def _init_serve_worker(event_queue):
+    global _event_queue
+    _event_queue = event_queue
+
+def _serve_job(key, job_id, pdf_path, options, stream=False):
+    # Tell the parent which process picked the job up: its clock starts now, not when
+    # the job was queued behind others
+    _event_queue.put({"started": key, "pid": os.getpid()})
+    if not stream:
+        payload = run_job(pdf_path, **options)
+        payload["id"] = job_id
+        return payload
+    # Streamed jobs send everything, final payload included, through the queue so
+    # it can't overtake the job's last events
+    on_event = lambda event: _event_queue.put(dict(event, id=job_id, job=key))
+    on_event(dict(run_job(pdf_path, on_event=on_event, **options), event="done"))
+    return None
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+def serve(num_workers=None):
+    # ✅ Warm worker mode: models are loaded once (preload) and inherited by the pool.
+    # Jobs arrive on stdin as line-delimited JSON ({"id": ..., "pdf_path": ..., plus any
+    # of JOB_OPTIONS}) and results are written to stdout as one JSON object per line,
+    # tagged with the job id. Each job first gets a {"event": "started"} line when a
+    # worker picks it up. Jobs with "stream": true also get their progress events
+    # (see process_resume), and their result arrives as the job's "done" event.
+    num_workers = num_workers or os.cpu_count() or 1
+    preload()
+    write_lock = threading.Lock()
+
+    def emit(payload):
+        if payload is None:
+            return
+        with write_lock:
+            write_line(payload)
+
+    # Jobs not answered yet, by serve-local key: {"id", "stream", "pid", "started_at"}
+    running = {}
+    running_changed = threading.Condition()
+
+    def finish(key, payload):
+        # A job's last line. Dropped if the watchdog already failed the job
+        with running_changed:
+            if running.pop(key, None) is None:
+                return
+            running_changed.notify_all()
+        emit(payload)
+
+    def failure(job, error, message):
+        return dict({"id": job["id"], "error": error, "message": message},
+                    **({"event": "done"} if job["stream"] else {}))
+
+    event_queue = multiprocessing.Queue()
+
+    def forward_events():
+        for event in iter(event_queue.get, None):
+            if "started" in event:
+                with running_changed:
+                    job = running.get(event["started"])
+                    if job is not None:
+                        job.update(pid=event["pid"], started_at=time.monotonic())
+                if job is not None:
+                    emit({"id": job["id"], "event": "started"})
+                continue
+            key = event.pop("job")
+            if event.get("event") == "done":
+                finish(key, event)
+            elif key in running:
+                emit(event)
+
+    def watchdog():
+        # ✅ Only the stuck job fails: its worker is killed and multiprocessing.Pool
+        # replaces it, so the other jobs in flight carry on. A killed (or crashed)
+        # worker's task never gets an answer from the pool, so it's failed here.
+        while True:
+            time.sleep(1)
+            now = time.monotonic()
+            with running_changed:
+                started = [(key, job) for key, job in running.items() if job.get("started_at") is not None]
+            for key, job in started:
+                if JOB_TIMEOUT and now - job["started_at"] > JOB_TIMEOUT:
+                    try:
+                        os.kill(job["pid"], signal.SIGKILL)
+                    except ProcessLookupError:
+                        pass
+                    message = f"No result within {JOB_TIMEOUT:g}s; worker {job['pid']} restarted"
+                    error = "Extractor_Timeout"
+                elif not _pid_alive(job["pid"]):
+                    message = f"Worker {job['pid']} exited while running the job"
+                    error = "Script_Execution_Failed"
+                else:
+                    continue
+                sys.stderr.write(f"serve: job {job['id']}: {message}\n")
+                log_to_csv("Extractor Job Failed", f"{job['id']}: {error}: {message}")
+                finish(key, failure(job, error, message))
+
+    forwarder = threading.Thread(target=forward_events, daemon=True)
+    forwarder.start()
+    threading.Thread(target=watchdog, daemon=True).start()
+
+    with multiprocessing.Pool(num_workers, initializer=_init_serve_worker, initargs=(event_queue,)) as pool:
+        emit({"ready": True, "workers": num_workers})
+        for key, line in enumerate(sys.stdin):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                job = json.loads(line)
+                job_id = job.get("id")
+                pdf_path = job["pdf_path"]
+                options = {name: job[name] for name in JOB_OPTIONS if name in job}
+                stream = bool(job.get("stream"))
+            except (json.JSONDecodeError, AttributeError, KeyError) as e:
+                emit({"id": None, "error": "Invalid_Input", "message": f"Malformed job line: {e}"})
+                continue
 
-        text = extract_text_from_pdf(pdf_path)
-        skills = extract_skills(text)
-        sys.stderr.write(f"Extracted Skills: {skills}\n")
+            with running_changed:
+                running[key] = {"id": job_id, "stream": stream}
+            pool.apply_async(
+                _serve_job, (key, job_id, pdf_path, options, stream),
+                # Streamed jobs return None: their result is the "done" event
+                callback=lambda payload, key=key: payload is not None and finish(key, payload),
+                error_callback=lambda e, key=key: finish(
+                    key, failure(running.get(key, {"id": None, "stream": False}), "Script_Execution_Failed", str(e))
+                )
+            )
+        # pool.join() would wait forever on a killed worker's task, so wait for every
+        # job to be answered instead; leaving the block terminates the pool
+        with running_changed:
+            running_changed.wait_for(lambda: not running)
+    event_queue.put(None)
+    forwarder.join()
+
+# Per-job options accepted from --serve job lines
+JOB_OPTIONS = ("mode", "refresh")
 
-        results = scrape_internshala(skills, text, num_to_score=top_n, initial_scrape_limit=50) 
-        
-        results_sorted = results 
-
-        final_output = []
-        for i, job in enumerate(results_sorted[:top_n], 1):
-            job_apply_link = convert_link(job["link"])
-            job["apply_link"] = job_apply_link
-
-            final_output.append({
-                "title": job['title'],
-                "company": job['company'],
-                "location": job["location"],
-                "stipend": job["stipend"],
-                "link": job["link"],
-                "apply": job_apply_link,
-                "ats": job.get('ats_score', 'N/A')
-            })
-
-        save_links_to_txt(results_sorted[:top_n])
-        details_to_csv(results_sorted[:top_n])
-
-        sys.stdout.write(json.dumps({ "internships": final_output }))
-        
-    except (ResourceExhausted, GoogleAPIError) as e:
-        error_type = "Gemini_Quota_Exhausted" if isinstance(e, ResourceExhausted) else "Gemini_API_Error"
-        error_message = str(e)
-        error_payload = {"error": error_type, "message": error_message}
-        sys.stdout.write(json.dumps(error_payload))
+# --- Main execution block ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract skills from a resume PDF and rank matching internships.")
+    parser.add_argument("pdf_path", nargs="?", help="path to the resume PDF")
+    parser.add_argument("--serve", action="store_true",
+                        help="run as a warm worker pool reading line-delimited JSON jobs from stdin")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("EXTRACTOR_WORKERS", "0")) or None,
+                        help="number of worker processes in --serve mode (default: CPU count)")
+    parser.add_argument("--mode", choices=SCORING_MODES, default=None,
+                        help="ATS scoring mode (default: $SCORING_MODE or llm)")
+    parser.add_argument("--refresh", action="store_true",
+                        help="ignore the resume cache: reparse the PDF and rank again")
+    parser.add_argument("--stream", action="store_true",
+                        help="write newline-delimited JSON progress events, ending with a \"done\" event")
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.workers)
+        sys.exit(0)
+
+    if not args.pdf_path:
+        sys.stderr.write("Usage: python skill_extractor.py <path_to_your_resume.pdf>\n")
         sys.exit(1)
-    except Exception as e:
-        error_payload = {"error": "Script_Execution_Failed", "message": str(e)}
-        sys.stdout.write(json.dumps(error_payload))
+
+    if args.stream:
+        result = run_job(args.pdf_path, mode=args.mode, on_event=write_line, refresh=args.refresh)
+        metrics.write_textfile()
+        write_line(dict(result, event="done"))
+    else:
+        result = run_job(args.pdf_path, mode=args.mode, refresh=args.refresh)
+        metrics.write_textfile()
+        sys.stdout.write(json.dumps(result))
+    if "error" in result:
         sys.exit(1)
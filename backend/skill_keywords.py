@@ -0,0 +1,155 @@
+# skill_keywords.py
+# Skill taxonomy shared by the extractor, the job sources and the local scorer.
+# Kept free of heavy imports so scorers can use it without loading spaCy.
+#
+# SKILL_TAXONOMY maps a category to its skills. A skill is its canonical name, or
+# (canonical name, [aliases]) when other spellings should resolve to it. Aliases
+# are matched like the canonical name (lowercase, whole words) and always reported
+# under the canonical name. After editing, rebuild the compiled index:
+#
+#   python skill_taxonomy.py
+SKILL_TAXONOMY = {
+    # 🧠 Broad Skill Domains / Roles
+    "roles": [
+        ("frontend developer", ["front end developer", "front-end developer"]),
+        ("backend developer", ["back end developer", "back-end developer"]),
+        ("fullstack developer", ["full stack developer", "full-stack developer"]),
+        "data scientist", "data analyst", "ai engineer", "mobile developer", "web3 developer",
+        "game developer", "cloud engineer", "qa engineer", "automation tester", "security analyst",
+    ],
+    "domains": [
+        ("machine learning", ["ml"]),
+        ("deep learning", ["dl"]),
+        ("artificial intelligence", ["ai"]),
+        ("nlp", ["natural language processing"]),
+        "computer vision", "data science", "mle", "devops",
+    ],
+    "languages": [
+        ("c++", ["cpp"]),
+        "python",
+        ("html", ["html5"]),
+        ("css", ["css3"]),
+    ],
+
+    # 🌐 Frontend Frameworks & Tools
+    "frontend": [
+        ("react.js", ["react", "reactjs", "react js"]),
+        ("vue.js", ["vue", "vuejs", "vue js"]),
+        ("next.js", ["nextjs", "next js"]),
+        "svelte",
+        ("tailwind css", ["tailwind", "tailwindcss"]),
+        "bootstrap", "chakra ui",
+        ("material ui", ["mui"]),
+        "vite", "framer motion", "styled components", "gsap",
+    ],
+
+    # 🔧 Backend Frameworks & Tools
+    "backend": [
+        ("express.js", ["expressjs", "express js"]),
+        ("nestjs", ["nest.js"]),
+        ("hapi.js", ["hapi"]),
+        "adonisjs", "laravel", "symfony", "fastapi",
+        ("asp.net core", [".net core"]),
+        ("rails", ["ruby on rails"]),
+        "gin gonic", "actix",
+        ("spring boot", ["springboot"]),
+        "fiber",
+    ],
+
+    # 🤖 Machine Learning / AI
+    "ml": [
+        ("scikit-learn", ["sklearn", "scikit learn"]),
+        "xgboost", "lightgbm", "catboost", "pytorch", "tensorflow", "keras", "onnx", "mlflow",
+        "huggingface transformers", "openvino", "deepspeed", "fastai", "auto-sklearn", "tpot",
+        ("wandb", ["weights and biases"]),
+        "optuna",
+    ],
+
+    # 💬 NLP Tools & Libraries
+    "nlp": [
+        "nltk", "spacy", "textblob", "gensim", "polyglot", "stanford nlp", "flair nlp",
+        ("huggingface", ["hugging face"]),
+        "transformers", "bert", "roberta", "gpt",
+        ("sentence-transformers", ["sentence transformers"]),
+    ],
+
+    # 📊 Data Science & Analytics
+    "data": [
+        ("power bi", ["powerbi"]),
+        "tableau", "looker", "superset", "metabase", "seaborn", "matplotlib", "plotly", "bokeh",
+        "pandas profiling", "sweetviz", "datapane", "dvc",
+    ],
+
+    # 🗃️ Databases & Storage
+    "databases": [
+        ("mongodb", ["mongo"]),
+        ("postgresql", ["postgres"]),
+        "redis", "neo4j", "dynamodb",
+        ("elasticsearch", ["elastic search"]),
+        "supabase", "influxdb", "cassandra",
+        ("firebase firestore", ["firestore"]),
+        "clickhouse", "tidb",
+    ],
+
+    # ☁️ DevOps / Cloud
+    "devops": [
+        "docker",
+        ("kubernetes", ["k8s"]),
+        "ansible", "terraform", "jenkins", "prometheus", "grafana", "pagerduty",
+        ("argocd", ["argo cd"]),
+        "helm", "azure pipelines", "aws lambda",
+        ("gcp cloud run", ["google cloud run"]),
+        "cloudflare", "netlify", "vercel",
+    ],
+
+    # 🔐 Cybersecurity
+    "security": [
+        "owasp zap",
+        ("burp suite", ["burpsuite"]),
+        "metasploit", "nmap", "wireshark", "snort", "splunk", "suricata", "hashicorp vault",
+        "fail2ban", "crowdstrike",
+    ],
+
+    # 📱 Mobile App Development
+    "mobile": [
+        "flutter",
+        ("react native", ["react-native"]),
+        "ionic", "xamarin", "kivy", "jetpack compose", "nativebase", "codemagic",
+    ],
+
+    # 🎮 Game Development / Graphics
+    "gamedev": [
+        "unity",
+        ("unreal engine", ["unreal"]),
+        "godot",
+        ("three.js", ["threejs"]),
+        ("babylon.js", ["babylonjs"]),
+        "blender", "panda3d", "playcanvas",
+    ],
+
+    # 🌍 Web3 / Blockchain
+    "web3": [
+        "solidity",
+        ("ethers.js", ["ethersjs"]),
+        ("web3.js", ["web3js"]),
+        "hardhat", "truffle", "alchemy", "moralis", "polygon", "chainlink", "ipfs", "pinata", "foundry",
+    ],
+
+    # 🧪 Testing / QA
+    "testing": [
+        "cypress", "playwright", "jest", "mocha", "chai", "postman", "newman", "selenium", "testcafe",
+        "allure",
+        ("jmeter", ["apache jmeter"]),
+    ],
+
+    # 🧠 Specialized AI Use Cases
+    "ai_applications": [
+        ("ocr", ["optical character recognition"]),
+        "image segmentation", "object detection", "face recognition", "pose estimation", "edge ai",
+        "tinyml", "autonomous agents", "rasa", "langchain",
+    ],
+}
+
+# Canonical names only, in taxonomy order
+SKILL_KEYWORDS = [skill if isinstance(skill, str) else skill[0]
+                  for skills in SKILL_TAXONOMY.values() for skill in skills]
@@ -0,0 +1,136 @@
+# skill_matcher.py
+# Single-pass skill matching over cleaned resume text.
+#
+# The automaton is an Aho-Corasick trie over characters, built once from the
+# skill list. One left-to-right scan reports every occurrence of every skill;
+# occurrences are then filtered with a word-boundary rule and resolved
+# longest-skill-first, so longer skills ("machine learning") claim their text
+# before shorter ones ("ml") can.
+#
+# An edge of a skill that is a word character needs a non-word character (or the
+# end of the text) next to it, like r'\b'. An edge that is punctuation ("c++",
+# ".net core") needs whitespace or the end of the text instead: r'\b' would
+# demand a word character there, so those skills could never match.
+
+
+def _is_word(ch):
+    # Same definition of a word character as the `re` module uses for str patterns
+    return ch.isalnum() or ch == "_"
+
+
+def _is_boundary(edge, neighbour):
+    # `edge` is the skill's first/last character, `neighbour` the text character
+    # just outside it ("" at either end of the text)
+    if not neighbour:
+        return True
+    return not _is_word(neighbour) if _is_word(edge) else neighbour.isspace()
+
+
+class SkillMatcher:
+    def __init__(self, patterns):
+        # `patterns` is an iterable of skill strings, or of (pattern, value) pairs
+        # when several aliases should report the same value.
+        entries = []
+        seen = set()
+        for item in patterns:
+            pattern, value = (item, item) if isinstance(item, str) else item
+            if not pattern or pattern in seen:
+                continue
+            seen.add(pattern)
+            entries.append((pattern, value))
+
+        # Priority order mirrors sorted(SKILL_KEYWORDS, key=len, reverse=True)
+        entries.sort(key=lambda entry: len(entry[0]), reverse=True)
+        self.patterns = [pattern for pattern, _ in entries]
+        self.values = [value for _, value in entries]
+        self._lengths = [len(pattern) for pattern in self.patterns]
+
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        for pid, pattern in enumerate(self.patterns):
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                node = nxt
+            self._out[node] = self._out[node] + (pid,)
+
+        # Breadth-first pass to set failure links and merge outputs along them
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                if self._out[self._fail[nxt]]:
+                    self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def tables(self):
+        # The compiled automaton as plain lists/dicts/tuples, e.g. for marshal (see skill_taxonomy.py)
+        return {"patterns": self.patterns, "values": self.values, "goto": self._goto, "fail": self._fail,
+                "out": self._out}
+
+    @classmethod
+    def from_tables(cls, tables):
+        # Rebuilds a matcher from tables() output without recompiling the automaton
+        matcher = cls.__new__(cls)
+        matcher.patterns = tables["patterns"]
+        matcher.values = tables["values"]
+        matcher._lengths = [len(pattern) for pattern in matcher.patterns]
+        matcher._goto = tables["goto"]
+        matcher._fail = tables["fail"]
+        matcher._out = tables["out"]
+        return matcher
+
+    def occurrences(self, text):
+        # Yields (start, end, pattern_id) for every whole-word occurrence, in one pass
+        goto, fail, out, lengths = self._goto, self._fail, self._out, self._lengths
+        n = len(text)
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if not out[node]:
+                continue
+            end = i + 1
+            # Every pattern reported here ends with `ch`, so the end check is shared
+            if not _is_boundary(ch, text[end] if end < n else ""):
+                continue
+            for pid in out[node]:
+                start = end - lengths[pid]
+                if _is_boundary(text[start], text[start - 1] if start > 0 else ""):
+                    yield start, end, pid
+
+    def find(self, text):
+        # Returns the set of matched values, resolving overlaps longest-skill-first
+        by_pattern = {}
+        for start, end, pid in self.occurrences(text):
+            by_pattern.setdefault(pid, []).append((start, end))
+
+        claimed = bytearray(len(text))
+        found = set()
+        for pid in sorted(by_pattern):
+            last_end = -1
+            hit = False
+            for start, end in sorted(by_pattern[pid]):
+                # Non-overlapping, leftmost-first, like re.sub on the same pattern
+                if start < last_end or any(claimed[start:end]):
+                    continue
+                claimed[start:end] = b"\x01" * (end - start)
+                last_end = end
+                hit = True
+            if hit:
+                found.add(self.values[pid])
+        return found
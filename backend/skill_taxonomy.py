@@ -0,0 +1,151 @@
+# skill_taxonomy.py
+# Every skill lookup goes through one taxonomy: canonical names, their aliases
+# and categories (defined in skill_keywords.py), plus one compiled matcher over
+# all spellings that always reports canonical names.
+#
+#   skill_taxonomy.find("built apis with reactjs and k8s")  -> {"react.js", "kubernetes"}
+#   skill_taxonomy.canonical("ReactJS")                     -> "react.js"
+#   skill_taxonomy.category("k8s")                          -> "devops"
+#
+# Compiling the Aho-Corasick automaton over every name and alias is the costly
+# part, so it is done offline into skill_index.bin (marshal of the name,
+# category and alias tables and the automaton's arrays); processes only load
+# it, and forked --serve workers share the loaded copy. The index stores a hash
+# of the taxonomy it was built from: if it is missing, stale or unreadable the
+# taxonomy is compiled in memory instead, with a warning on stderr.
+#
+#   python skill_taxonomy.py    # rebuild skill_index.bin after editing skill_keywords.py
+#
+# Skill IDs are positions in SKILL_KEYWORDS and only live inside a process;
+# results, search slugs and caches carry canonical names.
+import hashlib
+import marshal
+import os
+import sys
+
+from skill_keywords import SKILL_TAXONOMY
+from skill_matcher import SkillMatcher
+from stop_words_en import STOP_WORDS
+
+# Part of the taxonomy hash: bump when the index layout or the matching rules change,
+# so stale indexes are rebuilt and skills cached under the old rules are re-extracted
+INDEX_FORMAT = 2
+INDEX_PATH = os.getenv("SKILL_INDEX_PATH",
+                       os.path.join(os.path.dirname(os.path.abspath(__file__)), "skill_index.bin"))
+
+
+def normalize(skill):
+    # Lowercase, single-spaced and without stop words: the form extract_skills and
+    # LocalScorer hand text to the matcher in ("ruby on rails" -> "ruby rails")
+    return " ".join(token for token in skill.lower().split() if token not in STOP_WORDS)
+
+
+def taxonomy_hash(taxonomy=SKILL_TAXONOMY):
+    source = repr((INDEX_FORMAT, taxonomy, sorted(STOP_WORDS)))
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def compile_taxonomy(taxonomy=SKILL_TAXONOMY):
+    names, categories, aliases, spellings = [], [], {}, {}
+    for category, skills in taxonomy.items():
+        for skill in skills:
+            name, alternatives = (skill, []) if isinstance(skill, str) else skill
+            skill_id = len(names)
+            names.append(name)
+            categories.append(category)
+            for spelling in [name] + list(alternatives):
+                key = normalize(spelling)
+                if aliases.get(key, skill_id) != skill_id:
+                    raise ValueError(f"'{spelling}' is listed under both '{names[aliases[key]]}' and '{name}'")
+                aliases[key] = skill_id
+                spellings[key] = spelling
+    matcher = SkillMatcher(aliases.items())
+    # A spelling the matcher can't find even on its own would silently never match
+    dead = [spellings[key] for key, skill_id in aliases.items() if skill_id not in matcher.find(key)]
+    if dead:
+        raise ValueError(f"Spellings that never match themselves: {', '.join(map(repr, dead))}")
+    return {
+        "format": INDEX_FORMAT,
+        "hash": taxonomy_hash(taxonomy),
+        "names": names,
+        "categories": categories,
+        "aliases": aliases,
+        "matcher": matcher.tables(),
+    }
+
+
+class SkillTaxonomy:
+    def __init__(self, tables):
+        self.names = tables["names"]
+        self.categories = tables["categories"]
+        self.aliases = tables["aliases"]
+        self.matcher = SkillMatcher.from_tables(tables["matcher"])
+        self._ids = {name: skill_id for skill_id, name in enumerate(self.names)}
+        # Changes whenever the taxonomy does, e.g. to invalidate skills cached under an older one
+        self.version = tables["hash"]
+
+    def __len__(self):
+        return len(self.names)
+
+    def find_ids(self, text):
+        return self.matcher.find(text)
+
+    def find(self, text):
+        # Canonical names of every skill mentioned in (cleaned, lowercase) text
+        names = self.names
+        return {names[skill_id] for skill_id in self.matcher.find(text)}
+
+    def skill_id(self, skill):
+        skill_id = self._ids.get(skill)
+        return skill_id if skill_id is not None else self.aliases.get(normalize(skill))
+
+    def canonical(self, skill):
+        skill_id = self.skill_id(skill)
+        return None if skill_id is None else self.names[skill_id]
+
+    def category(self, skill):
+        skill_id = self.skill_id(skill)
+        return None if skill_id is None else self.categories[skill_id]
+
+    def ordered(self, skills):
+        # Canonical names, deduped, in taxonomy order (so equal skill sets give equal
+        # lists); skills the taxonomy doesn't know are kept, after the known ones
+        known, unknown = set(), []
+        for skill in skills:
+            skill_id = self.skill_id(skill)
+            if skill_id is not None:
+                known.add(skill_id)
+            elif skill not in unknown:
+                unknown.append(skill)
+        return [self.names[skill_id] for skill_id in sorted(known)] + unknown
+
+
+def write_index(path=INDEX_PATH):
+    tables = compile_taxonomy()
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        marshal.dump(tables, f)
+    os.replace(tmp_path, path)
+    return tables
+
+
+def load_taxonomy(path=INDEX_PATH):
+    try:
+        with open(path, "rb") as f:
+            tables = marshal.load(f)
+        if isinstance(tables, dict) and tables.get("format") == INDEX_FORMAT and tables.get("hash") == taxonomy_hash():
+            return SkillTaxonomy(tables)
+        sys.stderr.write(f"Skill index {path} is out of date, compiling in memory (run: python skill_taxonomy.py)\n")
+    except (OSError, EOFError, ValueError, TypeError) as e:
+        sys.stderr.write(f"Skill index unavailable ({e}), compiling in memory\n")
+    return SkillTaxonomy(compile_taxonomy())
+
+
+# ✅ Shared taxonomy, loaded once per process
+skill_taxonomy = load_taxonomy()
+
+
+if __name__ == "__main__":
+    tables = write_index()
+    sys.stdout.write(f"Wrote {INDEX_PATH}: {len(tables['names'])} skills, {len(tables['aliases'])} spellings, "
+                     f"{os.path.getsize(INDEX_PATH)} bytes\n")
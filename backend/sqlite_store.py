@@ -0,0 +1,58 @@
+# sqlite_store.py
+# The connection handling shared by the SQLite-backed stores (response_cache.py,
+# listing_store.py, resume_cache.py, llm_client.py): one file shared by every
+# process, one connection per process, WAL mode, and the schema applied on
+# first use.
+#
+# run(fn) calls fn(connection) under the store's lock; fn commits its own
+# writes, and anything left uncommitted is rolled back. A store failure must
+# never fail a job, so sqlite3 errors (and e.g. an unwritable cache directory)
+# are logged and run() returns None.
+import os
+import sqlite3
+import sys
+import threading
+
+
+class SQLiteStore:
+    def __init__(self, path, schema, label, enabled=True, schema_version=None, reset_script=""):
+        # If schema_version is set and the file's PRAGMA user_version differs,
+        # reset_script (e.g. DROP TABLE ...) runs before the schema is applied
+        self.path = path
+        self.schema = schema
+        self.label = label
+        self.enabled = enabled
+        self.schema_version = schema_version
+        self.reset_script = reset_script
+        self._lock = threading.Lock()
+        self._conn = None
+        self._conn_pid = None
+
+    def connect(self):
+        # One connection per process: a forked worker must not reuse its parent's handle
+        if self._conn is None or self._conn_pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            if self.schema_version is not None and \
+                    conn.execute("PRAGMA user_version").fetchone()[0] != self.schema_version:
+                conn.executescript(self.reset_script)
+                conn.execute(f"PRAGMA user_version = {int(self.schema_version)}")
+            conn.executescript(self.schema)
+            self._conn, self._conn_pid = conn, os.getpid()
+        return self._conn
+
+    def run(self, fn):
+        if not self.enabled:
+            return None
+        with self._lock:
+            try:
+                return fn(self.connect())
+            except (sqlite3.Error, OSError) as e:
+                sys.stderr.write(f"{self.label} error: {e}\n")
+                return None
+            finally:
+                # fn failed before its commit: don't leave the next caller inside its transaction
+                if self._conn is not None and self._conn.in_transaction:
+                    self._conn.rollback()
@@ -0,0 +1,139 @@
+import { spawn } from 'child_process';
+import path from 'path';
+import readline from 'readline';
+import { fileURLToPath } from 'url';
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = path.dirname(__filename);
+const backendDir = path.resolve(__dirname, '..');
+
+// ✅ One long-running `skill_extractor.py --serve` process (with its own pool of
+// Python workers) shared by every upload, so spaCy/NLTK/Gemini are loaded once.
+let worker = null;
+let nextJobId = 1;
+const pending = new Map();
+// The --serve process times jobs itself (from the moment a pool process picks one up)
+// and fails just the stuck job, restarting only its pool process. This deadline, armed
+// on the job's "started" line, is the last resort for a --serve process that stopped
+// answering altogether: it fails the job and restarts the whole worker.
+const JOB_TIMEOUT_MS = Number(process.env.EXTRACTOR_JOB_TIMEOUT_MS) || 180000;
+const LAST_RESORT_GRACE_MS = 30000;
+
+function settle(job, payload) {
+  clearTimeout(job.timer);
+  pending.delete(job.id);
+  job.resolve(payload);
+}
+
+// Fails the jobs that were sent to `child`
+function failPending(child, message) {
+  for (const job of [...pending.values()]) {
+    if (job.worker === child) settle(job, { error: 'Script_Execution_Failed', message });
+  }
+}
+
+function stopWorker(child, message) {
+  if (worker === child) worker = null;
+  failPending(child, message);
+  if (child.exitCode === null && child.signalCode === null) child.kill('SIGKILL');
+}
+
+function armLastResort(job) {
+  const timeoutMs = JOB_TIMEOUT_MS + LAST_RESORT_GRACE_MS;
+  job.timer = setTimeout(() => {
+    console.error(`❌ Extractor job ${job.id} got no answer ${timeoutMs} ms after starting, restarting the worker`);
+    settle(job, { error: 'Extractor_Timeout', message: `No result within ${timeoutMs / 1000}s` });
+    stopWorker(job.worker, 'Extractor worker restarted after it stopped answering');
+    warmExtractor();
+  }, timeoutMs);
+}
+
+function startWorker() {
+  const pythonPath = 'python3'; // or 'python'
+  const scriptPath = path.resolve(backendDir, 'skill_extractor.py');
+  const args = [scriptPath, '--serve'];
+  if (process.env.EXTRACTOR_WORKERS) args.push('--workers', process.env.EXTRACTOR_WORKERS);
+
+  const child = spawn(pythonPath, args, {
+    env: {
+      ...process.env,
+      PATH: `${path.join(backendDir, 'venv/bin')}:${process.env.PATH}`,
+      VIRTUAL_ENV: path.resolve(backendDir, 'venv')
+    }
+  });
+
+  readline.createInterface({ input: child.stdout }).on('line', (line) => {
+    let payload;
+    try {
+      payload = JSON.parse(line);
+    } catch (err) {
+      console.error('❌ Unparseable line from skill_extractor worker:', line);
+      return;
+    }
+    if (payload.ready) {
+      console.log(`✅ skill_extractor worker ready (${payload.workers} processes)`);
+      return;
+    }
+    const job = pending.get(payload.id);
+    if (!job) return;
+    delete payload.id;
+    if (payload.event === 'started') {
+      armLastResort(job);
+      return;
+    }
+    // Streamed jobs send progress events first; their result is the "done" event
+    if (payload.event && payload.event !== 'done') {
+      job.onEvent?.(payload);
+      return;
+    }
+    delete payload.event;
+    settle(job, payload);
+  });
+
+  child.stderr.on('data', (data) => {
+    console.error(`skill_extractor stderr: ${data}`);
+  });
+
+  child.on('exit', (code, signal) => {
+    console.error(`❌ skill_extractor worker exited with ${signal || `code ${code}`}`);
+    stopWorker(child, `Extractor worker exited with ${signal || `code ${code}`}`);
+  });
+
+  // spawn failures (e.g. ENOENT: no python3) and writes to a dead worker (EPIPE) arrive as
+  // 'error' events; unhandled, they would crash the server
+  child.on('error', (err) => {
+    console.error('❌ skill_extractor worker error:', err);
+    stopWorker(child, `Extractor worker failed: ${err.message}`);
+  });
+  child.stdin.on('error', (err) => {
+    console.error('❌ skill_extractor worker stdin error:', err);
+    stopWorker(child, `Extractor worker failed: ${err.message}`);
+  });
+
+  return child;
+}
+
+// Resolves with the same JSON payload the one-shot CLI prints:
+// { internships: [...] } on success or { error, message } on failure.
+// If onEvent is given the job is streamed: it is called with each progress event
+// ({ event: 'skills', skills } / { event: 'listing', internship }) before the result.
+// options are passed through as per-job options, e.g. { refresh: true } to bypass the
+// resume cache.
+export function runExtractor(pdfPath, onEvent = null, options = {}) {
+  if (!worker) worker = startWorker();
+
+  const child = worker;
+  const id = nextJobId++;
+  return new Promise((resolve) => {
+    const job = { id, resolve, onEvent, worker: child };
+    pending.set(id, job);
+
+    const line = { ...options, id, pdf_path: pdfPath };
+    if (onEvent) line.stream = true;
+    child.stdin.write(JSON.stringify(line) + '\n');
+  });
+}
+
+export function warmExtractor() {
+  if (!worker) worker = startWorker();
+}